@@ -0,0 +1,167 @@
+"""
+Login storm against a mock OAuth provider: many concurrent social logins,
+each fetching the profile through the mock adapter and looking up the
+owning user.
+
+Compares the previous behaviour (a new connection per profile request,
+exists() then get() for the user) with the pooled provider session and
+the single-query SocialAccountAdapter.find_user().
+
+By default an in-process stand-in for mock-oauth serves the profile; pass
+--profile-url to use the compose mock_oauth container instead. Runs
+against the database in DATABASE_URL; nothing is written.
+
+    python bench/oauth_login.py --logins 500 --threads 16
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+import requests
+from allauth.account.models import EmailAddress
+from allauth.socialaccount.models import SocialToken
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from dggcrm.accounts.adapters import SocialAccountAdapter
+from dggcrm.authmock.mock import MockDiscordOAuth2Adapter
+from dggcrm.metrics.collectors import PROVIDER_LATENCY
+
+
+class ProfileHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    email = ""
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        body = json.dumps({"sub": "42", "email": self.email, "username": "bench"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class UnpooledAdapter(MockDiscordOAuth2Adapter):
+    """
+    The adapter as it was: a bare requests.get per login.
+    """
+
+    def complete_login(self, request, app, token, **kwargs):
+        resp = requests.get(self.profile_url, headers={"Authorization": f"Bearer {token.token}"}, timeout=5)
+        resp.raise_for_status()
+        return self.get_provider().sociallogin_from_response(request, resp.json())
+
+
+def legacy_find_user(email):
+    User = get_user_model()
+    if User.objects.filter(email=email).exists():
+        return User.objects.get(email=email)
+    try:
+        return EmailAddress.objects.select_related("user").get(email__iexact=email, verified=True).user
+    except EmailAddress.DoesNotExist:
+        return None
+
+
+def login(adapter_class, find_user, profile_url):
+    request = RequestFactory().get("/")
+    adapter = adapter_class(request)
+    adapter.profile_url = profile_url
+    provider = adapter.get_provider()
+    sociallogin = adapter.complete_login(request, provider.app, SocialToken(token="bench"))
+    user = find_user(sociallogin.account.extra_data["email"])
+    if user is None:
+        raise RuntimeError("Profile email does not match a user")
+
+
+def storm(adapter_class, find_user, profile_url, logins, threads):
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            login(adapter_class, find_user, profile_url)
+        finally:
+            connections.close_all()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(logins)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99) - 1]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent social logins.")
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--profile-url", help="Profile endpoint of a running mock-oauth server")
+    parser.add_argument("--email", help="Email the profile returns (default: first user with one)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    email = args.email or get_user_model().objects.exclude(email="").values_list("email", flat=True).first()
+    if not email:
+        sys.exit("No user with an email to log in as")
+
+    server = None
+    profile_url = args.profile_url
+    if profile_url is None:
+        ProfileHandler.email = email
+        server = ThreadingHTTPServer(("127.0.0.1", 0), ProfileHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        profile_url = f"http://127.0.0.1:{server.server_port}/mock-discord/userinfo"
+
+    find_user = SocialAccountAdapter().find_user
+    with CaptureQueriesContext(connection) as legacy_queries:
+        legacy_find_user(email)
+    with CaptureQueriesContext(connection) as pooled_queries:
+        find_user(email)
+
+    print(f"{args.logins} logins on {args.threads} threads against {profile_url}")
+    print(f"{'mode':<10}{'total s':>10}{'p50 ms':>10}{'p99 ms':>10}{'conns':>8}{'queries':>9}")
+    for name, adapter_class, lookup, num_queries in [
+        ("before", UnpooledAdapter, legacy_find_user, len(legacy_queries)),
+        ("pooled", MockDiscordOAuth2Adapter, find_user, len(pooled_queries)),
+    ]:
+        ProfileHandler.connections = 0
+        elapsed, p50, p99 = storm(adapter_class, lookup, profile_url, args.logins, args.threads)
+        conns = ProfileHandler.connections if server else "-"
+        print(f"{name:<10}{elapsed:>10.2f}{p50 * 1000:>10.2f}{p99 * 1000:>10.2f}{conns:>8}{num_queries:>9}")
+
+    totals = {}
+    for sample in PROVIDER_LATENCY.collect()[0].samples:
+        if sample.name.endswith(("_count", "_sum")):
+            totals.setdefault(sample.labels["host"], {})[sample.name.rsplit("_", 1)[1]] = sample.value
+    for host, total in totals.items():
+        print(f"provider session {host}: {total['count']:.0f} requests, "
+              f"avg {total['sum'] * 1000 / total['count']:.2f} ms")
+
+    if server:
+        server.shutdown()
@@ -0,0 +1,155 @@
+"""
+Compares throughput and latency of the ticket and contact list endpoints
+served by `manage.py runserver` and by gunicorn with config/gunicorn.py.
+
+Each server is started in turn on a free local port against the database
+in DATABASE_URL and loaded by --concurrency keep-alive clients for
+--duration seconds per endpoint. Requests authenticate as an existing
+user with a service access token; nothing is written.
+
+    python bench/serve.py --username admin --concurrency 16 --duration 10
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+
+from dggcrm.accounts.tokens import ServiceAccessToken
+
+ENDPOINTS = [
+    "/api/tickets/",
+    "/api/contacts/",
+]
+
+SERVERS = ["runserver", "gunicorn"]
+
+
+def server_command(name, port, args):
+    if name == "runserver":
+        return [sys.executable, "manage.py", "runserver", "--noreload", f"127.0.0.1:{port}"]
+    return [
+        sys.executable, "-m", "gunicorn",
+        "--config", "config/gunicorn.py",
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(args.workers),
+        "--threads", str(args.threads),
+        "config.wsgi",
+    ]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    sys.exit(f"Server on port {port} did not start")
+
+
+def load(port, path, headers, concurrency, duration):
+    """
+    Returns the latency in seconds of every request completed in `duration`.
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        mine = []
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                break
+            mine.append(time.perf_counter() - start)
+            if response.getheader("Connection", "").lower() == "close":
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        sys.exit(f"GET {path} returned {errors[0]}")
+    return latencies
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark runserver against gunicorn.")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--threads", type=int, default=4)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    user = get_user_model().objects.get(username=args.username)
+    headers = {"Authorization": f"Bearer {ServiceAccessToken.for_user(user)}"}
+
+    print(f"{args.concurrency} clients, {args.duration:g}s per endpoint, "
+          f"gunicorn {args.workers} workers x {args.threads} threads")
+    print(f"{'server':<12}{'endpoint':<18}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    throughput = {}
+    for name in SERVERS:
+        port = free_port()
+        server = subprocess.Popen(
+            server_command(name, port, args),
+            cwd=SERVER_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up(port)
+            for path in ENDPOINTS:
+                # Warm up imports, caches and connections
+                load(port, path, headers, args.concurrency, 1)
+                latencies = load(port, path, headers, args.concurrency, args.duration)
+                rate = len(latencies) / args.duration
+                throughput[name, path] = rate
+                p50 = statistics.median(latencies) * 1000
+                p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+                print(f"{name:<12}{path:<18}{rate:>10.1f}{p50:>10.2f}{p99:>10.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+    for path in ENDPOINTS:
+        speedup = throughput["gunicorn", path] / throughput["runserver", path]
+        print(f"gunicorn serves {speedup:.1f}x the requests of runserver on {path}")
@@ -0,0 +1,88 @@
+"""
+Compares database round-trips and latency of the hot API endpoints with
+the plain database session engine and the cached_db engine (sessions read
+from the "sessions" cache, written through to the database).
+
+Runs against the database in DATABASE_URL as an existing user. A session
+is created for each engine and deleted afterwards; nothing else is written.
+
+    python bench/sessions.py --username admin --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+ENGINES = [
+    ("db", "django.contrib.sessions.backends.db"),
+    ("cached_db", "django.contrib.sessions.backends.cached_db"),
+]
+
+ENDPOINTS = [
+    "/api/auth/user/",
+    "/api/tickets/",
+    "/api/events/",
+    "/api/contacts/",
+]
+
+
+def measure(client, path, repeat):
+    # The first request warms the session cache and any other caches
+    client.get(path)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(path)
+    if response.status_code != 200:
+        sys.exit(f"GET {path} returned {response.status_code}")
+
+    statements = [query["sql"] for query in queries if query["sql"] not in ("BEGIN", "COMMIT")]
+    session_queries = sum("django_session" in sql for sql in statements)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        client.get(path)
+    return (time.perf_counter() - start) / repeat, len(statements), session_queries
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark session engines on hot endpoints.")
+    parser.add_argument("--username", help="User to log in as (default: first superuser)")
+    parser.add_argument("--repeat", type=int, default=200)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    users = get_user_model().objects.filter(is_active=True)
+    user = users.get(username=args.username) if args.username else users.filter(is_superuser=True).first()
+    if user is None:
+        sys.exit("No user to log in as")
+
+    print(f"{args.repeat} requests per endpoint, as {user.username}, on {connection.vendor}")
+    print(f"{'engine':<12}{'endpoint':<20}{'ms/req':>10}{'queries':>10}{'session':>10}")
+    totals = {}
+    for name, engine in ENGINES:
+        # SessionMiddleware picks the engine when a client's handler loads
+        with override_settings(SESSION_ENGINE=engine, ALLOWED_HOSTS=["testserver"]):
+            client = Client()
+            client.force_login(user)
+            for path in ENDPOINTS:
+                latency, num_queries, session_queries = measure(client, path, args.repeat)
+                totals.setdefault(name, []).append((latency, num_queries))
+                print(f"{name:<12}{path:<20}{latency * 1000:>10.2f}{num_queries:>10}{session_queries:>10}")
+            client.logout()
+
+    saved = sum(n for _, n in totals["db"]) - sum(n for _, n in totals["cached_db"])
+    print(f"cached_db saves {saved} queries over {len(ENDPOINTS)} requests")
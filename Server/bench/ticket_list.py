@@ -0,0 +1,87 @@
+"""
+Compares the CPU cost of building a ticket list page with TicketSerializer
+against the compact values() representation used by the tickets list API.
+
+Runs against the database in DATABASE_URL, which needs some tickets
+(see fake/main.py). Nothing is written.
+
+    python bench/ticket_list.py --rows 100 --repeat 50
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from dggcrm.tickets.models import Ticket
+from dggcrm.tickets.serializers import TicketSerializer, compact_ticket_data, compact_ticket_rows
+
+
+# Every builder clones the queryset so no run is served from its result cache
+def serializer_page(queryset):
+    return TicketSerializer(list(queryset.all()), many=True).data
+
+
+def serializer_select_related_page(queryset):
+    return TicketSerializer(list(queryset.select_related("assigned_to", "reported_by")), many=True).data
+
+
+def compact_page(queryset):
+    return compact_ticket_data(list(compact_ticket_rows(queryset)))
+
+
+def measure(build, queryset, repeat):
+    with CaptureQueriesContext(connection) as queries:
+        build(queryset)
+    num_queries = len(queries)
+
+    wall = cpu = 0.0
+    for _ in range(repeat):
+        reset_queries()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        build(queryset)
+        wall += time.perf_counter() - wall_start
+        cpu += time.process_time() - cpu_start
+
+    return wall / repeat, cpu / repeat, num_queries
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark ticket list serialization.")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    queryset = Ticket.objects.order_by("priority", "-created_at")[:args.rows]
+
+    expected = json.dumps(serializer_page(queryset))
+    if json.dumps(compact_page(queryset)) != expected:
+        sys.exit("Compact output differs from TicketSerializer")
+
+    print(f"{args.rows} rows, {args.repeat} runs each")
+    print(f"{'mode':<28}{'wall ms':>10}{'cpu ms':>10}{'queries':>10}")
+    results = {}
+    for name, build in [
+        ("serializer", serializer_page),
+        ("serializer + select_related", serializer_select_related_page),
+        ("compact values()", compact_page),
+    ]:
+        wall, cpu, num_queries = measure(build, queryset, args.repeat)
+        results[name] = cpu
+        print(f"{name:<28}{wall * 1000:>10.2f}{cpu * 1000:>10.2f}{num_queries:>10}")
+
+    saved = 1 - results["compact values()"] / results["serializer"]
+    print(f"compact saves {saved:.0%} of serializer CPU time")
@@ -0,0 +1,64 @@
+"""
+Gunicorn configuration for serving config.wsgi in production.
+
+    gunicorn -c config/gunicorn.py config.wsgi
+
+The app is loaded once in the master and forked into the workers. Send the
+master SIGHUP to reload this configuration and replace the workers one by
+one without dropping requests; code changes need a full restart, since
+the workers are forked from the preloaded app.
+"""
+import multiprocessing
+import os
+import shutil
+
+import environ
+
+env = environ.Env()
+
+bind = env("GUNICORN_BIND", default="0.0.0.0:8080")
+
+# Processes, and threads per process; each thread may hold one pooled
+# database connection, so keep threads within the pool's max_size
+workers = env.int("WEB_CONCURRENCY", default=multiprocessing.cpu_count() * 2 + 1)
+threads = env.int("GUNICORN_THREADS", default=4)
+worker_class = "gthread" if threads > 1 else "sync"
+
+preload_app = True
+
+# Seconds an idle client connection is kept open; keep it above the idle
+# timeout of the proxy in front so it never reuses a closed connection
+keepalive = env.int("GUNICORN_KEEPALIVE", default=75)
+# Seconds a request may run before its worker is killed and replaced
+timeout = env.int("GUNICORN_TIMEOUT", default=30)
+# Seconds workers get to finish in-flight requests on reload or shutdown
+graceful_timeout = env.int("GUNICORN_GRACEFUL_TIMEOUT", default=30)
+
+# Replace each worker after this many requests (0 never), staggered so they
+# do not all restart at once
+max_requests = env.int("GUNICORN_MAX_REQUESTS", default=5000)
+max_requests_jitter = max_requests // 10
+
+# Worker heartbeats go to memory rather than a possibly slow disk
+worker_tmp_dir = "/dev/shm"
+
+# Trust X-Forwarded-* from the proxy in front
+forwarded_allow_ips = env("FORWARDED_ALLOW_IPS", default="127.0.0.1")
+
+accesslog = "-"
+loglevel = env("GUNICORN_LOG_LEVEL", default="info")
+
+
+def on_starting(server):
+    # Request metrics of the previous run would otherwise be added to these
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -10,9 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+from datetime import timedelta
 from pathlib import Path
 import os
 import environ
+from corsheaders.defaults import default_headers
+
+from dggcrm.db.pool import pooled
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -35,6 +39,8 @@ ALLOWED_HOSTS = os.getenv(
 # CORS settings - Allow all origins for development
 # TODO: Change for production
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key", "if-match", "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag", "Idempotent-Replayed", "Server-Timing"]
 
 # Application definition
 
@@ -45,6 +51,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -65,6 +72,12 @@ LOCAL_APPS = [
     "dggcrm.tickets",
     "dggcrm.events",
     "dggcrm.accounts",
+    "dggcrm.audit",
+    "dggcrm.notifications",
+    "dggcrm.idempotency",
+    "dggcrm.db",
+    "dggcrm.profiling",
+    "dggcrm.metrics",
 
     # For local mock only
     "dggcrm.authmock.apps.AuthMockConfig",
@@ -74,6 +87,8 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "dggcrm.profiling.middleware.ServerTimingMiddleware",
+    "dggcrm.metrics.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -86,6 +101,27 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
 ]
 
+# Share of requests broken down into DB, serializer and render time in a
+# Server-Timing header and a "dggcrm.profiling.middleware" log line. Off
+# unless set (e.g. SERVER_TIMING_SAMPLE_RATE=1 to time every request)
+SERVER_TIMING_SAMPLE_RATE = env.float("SERVER_TIMING_SAMPLE_RATE", default=0.0)
+
+# Prometheus scrapes /api/internal/metrics/ with "Authorization: Bearer
+# <METRICS_TOKEN>"; under gunicorn, PROMETHEUS_MULTIPROC_DIR must point at a
+# directory shared by the workers so the scrape covers all of them
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "dggcrm.profiling": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -109,9 +145,103 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {"default": env.db("DATABASE_URL")}
+# PostgreSQL connections are pooled per process and checked on checkout;
+# tune the pool with pool_* options on the URL (see dggcrm.db.pool), e.g.
+# ?pool_min_size=2&pool_max_size=10, or turn it off with ?pool=false
+DATABASES = {"default": pooled(env.db("DATABASE_URL"))}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
 
+# Optional read replica. Safe-method API requests read the CRM tables from
+# it in autocommit (see dggcrm.db), except for REPLICA_STICKY_SECONDS after
+# the user's own write and while it lags more than REPLICA_MAX_LAG_SECONDS
+if env("REPLICA_DATABASE_URL", default=""):
+    DATABASES["replica"] = pooled(env.db("REPLICA_DATABASE_URL"))
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["dggcrm.db.routers.ReadReplicaRouter"]
+REPLICA_STICKY_SECONDS = env.float("REPLICA_STICKY_SECONDS", default=5.0)
+REPLICA_MAX_LAG_SECONDS = env.float("REPLICA_MAX_LAG_SECONDS", default=2.0)
+
+# CACHE_URL must point at a cache shared by all workers (e.g.
+# redis://redis:6379/0; the production entrypoint builds it from REDIS_HOST)
+# for the current-user cache and replica stickiness, which refuse to start
+# on the per-process default (see accounts.checks and db.checks)
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+    # Every worker on a host shares the file cache, so a logout is seen by
+    # all of them; use a shared server cache when running several hosts
+    "sessions": env.cache(
+        "SESSION_CACHE_URL",
+        default=f"filecache://{BASE_DIR / 'cache' / 'sessions'}",
+    ),
+}
+
+# Sessions are read from the "sessions" cache and written through to the
+# database, which stays the source of truth. Expired rows are removed by
+# `manage.py clear_expired_sessions`
+SESSION_ENGINE = env("SESSION_ENGINE", default="django.contrib.sessions.backends.cached_db")
+SESSION_CACHE_ALIAS = "sessions"
+
+# /api/auth/user/ payloads are cached for up to this long and dropped
+# early when the user, their emails or social accounts change. Needs a
+# CACHE_URL shared by all workers (checked at startup); 0 turns it off
+CURRENT_USER_CACHE_SECONDS = env.int(
+    "CURRENT_USER_CACHE_SECONDS",
+    default=300 if env("CACHE_URL", default="") else 0,
+)
+
+# Audit log writing
+# "sync" lets django-auditlog insert LogEntry rows inline on every save.
+# "batched" captures diffs into the audit outbox and flushes them after the
+# response (see dggcrm.audit.buffer and `manage.py flush_audit_outbox`).
+AUDITLOG_WRITE_MODE = env("AUDITLOG_WRITE_MODE", default="sync")
+AUDITLOG_OUTBOX_BATCH_SIZE = env.int("AUDITLOG_OUTBOX_BATCH_SIZE", default=500)
+
+# Audit log partitions older than this are archived by
+# `manage.py audit_partitions archive` (see dggcrm.audit.partitions)
+AUDITLOG_RETENTION_MONTHS = env.int("AUDITLOG_RETENTION_MONTHS", default=12)
+AUDITLOG_ARCHIVE_DIR = env("AUDITLOG_ARCHIVE_DIR", default=str(BASE_DIR / "archive" / "auditlog"))
+
+# Serve tickets/group_by_contact from the trigger-maintained per-contact
+# daily counts instead of counting tickets (PostgreSQL only)
+TICKET_CONTACT_COUNTS_PRECOMPUTED = env.bool("TICKET_CONTACT_COUNTS_PRECOMPUTED", default=False)
+
+# `manage.py escalate_tickets` raises the priority of tickets in these
+# statuses by one level once they have gone untouched this many days,
+# up to TICKET_ESCALATION_MAX_PRIORITY (0 is the most urgent)
+TICKET_ESCALATION_STATUSES = env.list("TICKET_ESCALATION_STATUSES", default=["OPEN", "TODO"])
+TICKET_ESCALATION_AFTER_DAYS = env.int("TICKET_ESCALATION_AFTER_DAYS", default=14)
+TICKET_ESCALATION_MAX_PRIORITY = env.int("TICKET_ESCALATION_MAX_PRIORITY", default=1)
+TICKET_ESCALATION_BATCH_SIZE = env.int("TICKET_ESCALATION_BATCH_SIZE", default=5000)
+
+# New tickets are checked against open tickets for the same contact/event
+# with a title at least this similar (trigram similarity, 0.3 to 1).
+# "warn" creates the ticket and returns the candidates, "reject" refuses it
+TICKET_DUPLICATE_SIMILARITY = env.float("TICKET_DUPLICATE_SIMILARITY", default=0.5)
+TICKET_DUPLICATE_ACTION = env("TICKET_DUPLICATE_ACTION", default="warn")
+
+# Responses to writes sent with an Idempotency-Key header are replayed for
+# retries within this window (see dggcrm.idempotency)
+IDEMPOTENCY_KEY_TTL_HOURS = env.int("IDEMPOTENCY_KEY_TTL_HOURS", default=24)
+
+# Ticket notifications are queued in the request transaction and sent by
+# `manage.py send_notifications` over "email" or "webhook"
+NOTIFICATIONS_CHANNEL = env("NOTIFICATIONS_CHANNEL", default="email")
+NOTIFICATIONS_WEBHOOK_URL = env("NOTIFICATIONS_WEBHOOK_URL", default="")
+NOTIFICATIONS_WEBHOOK_TIMEOUT = env.float("NOTIFICATIONS_WEBHOOK_TIMEOUT", default=10.0)
+NOTIFICATIONS_BATCH_SIZE = env.int("NOTIFICATIONS_BATCH_SIZE", default=100)
+NOTIFICATIONS_LEASE_SECONDS = env.int("NOTIFICATIONS_LEASE_SECONDS", default=300)
+NOTIFICATIONS_MAX_ATTEMPTS = env.int("NOTIFICATIONS_MAX_ATTEMPTS", default=8)
+NOTIFICATIONS_RETRY_BASE_SECONDS = env.int("NOTIFICATIONS_RETRY_BASE_SECONDS", default=30)
+NOTIFICATIONS_RETRY_MAX_SECONDS = env.int("NOTIFICATIONS_RETRY_MAX_SECONDS", default=3600)
+
+# Mail is written to files under EMAIL_FILE_PATH unless EMAIL_BACKEND
+# points at a real server
+EMAIL_BACKEND = env("EMAIL_BACKEND", default="django.core.mail.backends.filebased.EmailBackend")
+EMAIL_FILE_PATH = env("EMAIL_FILE_PATH", default=str(BASE_DIR / "mail"))
+EMAIL_HOST = env("EMAIL_HOST", default="localhost")
+EMAIL_PORT = env.int("EMAIL_PORT", default=25)
+DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="notifications@localhost")
+
 
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -125,10 +255,30 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        # Bots and integrations send "Authorization: Bearer <access token>"
+        "dggcrm.accounts.authentication.ServiceTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
 }
 
+# Service tokens (see dggcrm.accounts.tokens). Refresh tokens are rotated
+# on every use; revoked tokens are refused by every worker from their next
+# request
+SIMPLE_JWT = {
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=env.int("JWT_ACCESS_TOKEN_MINUTES", default=5)),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=env.int("JWT_REFRESH_TOKEN_DAYS", default=7)),
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
+    "UPDATE_LAST_LOGIN": False,
+    "SIGNING_KEY": env("JWT_SIGNING_KEY", default=SECRET_KEY),
+    "AUTH_TOKEN_CLASSES": ("dggcrm.accounts.tokens.ServiceAccessToken",),
+}
+
+# Restrict what non-staff users outside ORGANIZER_GROUP can see to their
+# own events and tickets (see dggcrm.accounts.scopes)
+ROW_LEVEL_SCOPING = env.bool("ROW_LEVEL_SCOPING", default=False)
+ORGANIZER_GROUP = env("ORGANIZER_GROUP", default="Organizers")
+
 REST_AUTH = {
     "USER_DETAILS_SERIALIZER": "dggcrm.accounts.serializers.CustomUserDetailsSerializer",
 }
@@ -196,6 +346,12 @@ SOCIALACCOUNT_EMAIL_REQUIRED = True
 SOCIALACCOUNT_EMAIL_VERIFICATION = "optional"
 SOCIALACCOUNT_ADAPTER = "dggcrm.accounts.adapters.SocialAccountAdapter"
 
+# Pooled HTTP client for OAuth provider calls (see dggcrm.accounts.http).
+# Connection failures and 502-504 responses are retried this many times
+OAUTH_HTTP_TIMEOUT = env.float("OAUTH_HTTP_TIMEOUT", default=5.0)
+OAUTH_HTTP_RETRIES = env.int("OAUTH_HTTP_RETRIES", default=2)
+OAUTH_HTTP_POOL_SIZE = env.int("OAUTH_HTTP_POOL_SIZE", default=16)
+
 LOGIN_URL = "/login"
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/login?logout"
@@ -35,6 +35,8 @@ urlpatterns = [
     path('api/', include('dggcrm.events.urls')),
     path('api/', include('dggcrm.tickets.urls')),
     path('api/', include('dggcrm.accounts.urls')),
+    path('api/', include('dggcrm.db.urls')),
+    path('api/', include('dggcrm.metrics.urls')),
 
     # API auth
     # path("api/auth/", include("dj_rest_auth.urls")),
@@ -1,11 +1,13 @@
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
 from allauth.account.adapter import DefaultAccountAdapter
 from allauth.core.exceptions import ImmediateHttpResponse
-from allauth.account.models import EmailAddress
 from django.contrib.auth import get_user_model
+from django.db.models import Case, Q, When
 from django.shortcuts import redirect
 from django.core.exceptions import PermissionDenied
 
+from .http import provider_session
+
 class SocialLoginForbidden(Exception):
     """Raised when a social login is not allowed (non-existing user)."""
     def __init__(self, email=None):
@@ -28,27 +30,36 @@ class SocialAccountAdapter(DefaultSocialAccountAdapter):
                 redirect("/login?social_error=no_email")
             )
 
-        # First check user table's email, then check EmailAddress table
-        User = get_user_model()
-        if User.objects.filter(email=email).exists():
-            user = User.objects.get(email=email)
-        else:
-            try:
-                email_address = EmailAddress.objects.select_related("user").get(
-                    email__iexact=email,
-                    verified=True,
-                )
-                user = email_address.user
-            except EmailAddress.DoesNotExist:
-                # No verified email anywhere in the system
-                request.session.flush()
-                raise ImmediateHttpResponse(
-                    redirect(f"/login?social_error=no_user&email={email}")
-                )
+        user = self.find_user(email)
+        if user is None:
+            # No verified email anywhere in the system
+            request.session.flush()
+            raise ImmediateHttpResponse(
+                redirect(f"/login?social_error=no_user&email={email}")
+            )
 
         # Link this social account to the owning user
         sociallogin.connect(request, user)
 
+    def find_user(self, email):
+        """
+        The user owning `email`, in one query. A match on the user table's
+        email wins over a verified EmailAddress.
+        """
+        return (
+            get_user_model().objects
+            .filter(
+                Q(email=email)
+                | Q(emailaddress__email__iexact=email, emailaddress__verified=True)
+            )
+            .order_by(Case(When(email=email, then=0), default=1), "pk")
+            .first()
+        )
+
+    def get_requests_session(self):
+        # Used by allauth for provider token and profile requests
+        return provider_session()
+
     def is_open_for_signup(self, request, sociallogin):
         # No signups
         request.session.flush()
@@ -4,4 +4,9 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dggcrm.accounts"
-    verbose_name = "CRM.accounts"
\ No newline at end of file
+    verbose_name = "CRM.accounts"
+
+    def ready(self):
+        from . import cache, checks  # noqa: F401
+
+        cache.connect_signals()
@@ -0,0 +1,74 @@
+from auditlog.context import auditlog_value
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+from .tokens import revoked_access_tokens
+
+
+def token_user_cache_key(user_id):
+    return f"accounts:token_user:{user_id}"
+
+
+class ServiceTokenAuthentication(JWTAuthentication):
+    """
+    Bearer JWT authentication for bots and integrations. Tokens are
+    validated without touching the database and the user is loaded along
+    with the token's revocation in one query or, when
+    CURRENT_USER_CACHE_SECONDS is set, from the shared cache, so these
+    requests never read the session table. No CSRF token is needed.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            # AuditlogMiddleware captured an anonymous actor before DRF
+            # authenticated the request
+            try:
+                context = auditlog_value.get()
+            except LookupError:
+                pass
+            else:
+                if context.get("actor") is None:
+                    context["actor"] = result[0]
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+
+        if settings.CURRENT_USER_CACHE_SECONDS <= 0:
+            # The user and whether the token was revoked, in one query
+            user = (
+                self.user_model.objects
+                .filter(**{api_settings.USER_ID_FIELD: user_id})
+                .annotate(token_revoked=Exists(RevokedToken.objects.filter(jti=jti)))
+                .first()
+            )
+            if user is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            if user.token_revoked:
+                raise InvalidToken(_("Token has been revoked"))
+            if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+            return user
+
+        if jti in revoked_access_tokens():
+            raise InvalidToken(_("Token has been revoked"))
+
+        # Dropped whenever the user is saved (see accounts.cache)
+        key = token_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.CURRENT_USER_CACHE_SECONDS)
+        return user
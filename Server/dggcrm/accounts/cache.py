@@ -0,0 +1,74 @@
+"""
+Cached /api/auth/user/ payloads.
+
+Each user's serialized details are kept in the default cache with an ETag
+and dropped whenever the user, one of their email addresses or one of
+their social accounts is saved or deleted. CURRENT_USER_CACHE_SECONDS
+bounds staleness from changes that bypass model signals (queryset
+updates); 0 turns the cache off. The user objects ServiceTokenAuthentication
+caches are dropped along with them when the user changes.
+
+Entries are dropped from the cache the change was made through, so it has
+to be shared by all workers (see accounts.checks).
+"""
+import hashlib
+
+from allauth.account.models import EmailAddress
+from allauth.socialaccount.models import SocialAccount
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.http import quote_etag
+from rest_framework.renderers import JSONRenderer
+
+from .authentication import token_user_cache_key
+from .serializers import UserDetailsSerializer
+
+
+def _cache_key(user_id):
+    return f"accounts:current_user:{user_id}"
+
+
+def current_user_payload(user):
+    """
+    ``(data, etag)`` for UserDetailsSerializer(user), from the cache when
+    possible.
+    """
+    timeout = settings.CURRENT_USER_CACHE_SECONDS
+    key = _cache_key(user.pk)
+    cached = cache.get(key) if timeout > 0 else None
+    if cached is not None:
+        return cached
+
+    data = UserDetailsSerializer(user).data
+    etag = quote_etag(hashlib.sha256(JSONRenderer().render(data)).hexdigest()[:32])
+    if timeout > 0:
+        cache.set(key, (data, etag), timeout)
+    return data, etag
+
+
+def invalidate_current_user(user_id):
+    # After commit, so a concurrent request cannot cache the old rows again
+    # once the entry is gone
+    transaction.on_commit(lambda: cache.delete(_cache_key(user_id)))
+
+
+def _user_changed(sender, instance, **kwargs):
+    invalidate_current_user(instance.pk)
+    transaction.on_commit(lambda: cache.delete(token_user_cache_key(instance.pk)))
+
+
+def _related_changed(sender, instance, **kwargs):
+    invalidate_current_user(instance.user_id)
+
+
+def connect_signals():
+    User = get_user_model()
+    post_save.connect(_user_changed, sender=User, dispatch_uid="current_user_user_saved")
+    post_delete.connect(_user_changed, sender=User, dispatch_uid="current_user_user_deleted")
+    post_save.connect(_related_changed, sender=EmailAddress, dispatch_uid="current_user_email_saved")
+    post_delete.connect(_related_changed, sender=EmailAddress, dispatch_uid="current_user_email_deleted")
+    post_save.connect(_related_changed, sender=SocialAccount, dispatch_uid="current_user_social_saved")
+    post_delete.connect(_related_changed, sender=SocialAccount, dispatch_uid="current_user_social_deleted")
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core import checks
+
+# Cache backends whose entries are only visible to the process that set them
+PER_PROCESS_CACHES = {"django.core.cache.backends.locmem.LocMemCache"}
+
+
+@checks.register(checks.Tags.caches)
+def check_current_user_cache(app_configs, **kwargs):
+    """
+    Cached users are dropped when they change, but only from the cache the
+    change was made through: with a per-process cache every other worker
+    keeps serving the old user until the entry expires.
+    """
+    if settings.CURRENT_USER_CACHE_SECONDS <= 0:
+        return []
+    if settings.CACHES["default"]["BACKEND"] not in PER_PROCESS_CACHES:
+        return []
+    return [
+        checks.Error(
+            "CURRENT_USER_CACHE_SECONDS is set but the default cache is local to each process.",
+            hint="Set CACHE_URL to a cache shared by all workers (e.g. redis://cache:6379/0) "
+                 "or CURRENT_USER_CACHE_SECONDS=0.",
+            id="accounts.E001",
+        )
+    ]
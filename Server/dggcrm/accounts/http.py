@@ -0,0 +1,65 @@
+"""
+Shared HTTP client for OAuth provider calls (token exchange, profile).
+
+One pooled, keep-alive requests.Session per process, with a default
+timeout, bounded retries of connection failures and gateway errors, and
+per-host request metrics (see dggcrm.metrics).
+"""
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from dggcrm.metrics.collectors import observe_provider
+
+
+class ProviderSession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        retry = Retry(
+            total=settings.OAUTH_HTTP_RETRIES,
+            # Only idempotent calls are retried after the request was sent;
+            # an authorization code cannot be redeemed twice
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            status_forcelist=(502, 503, 504),
+            backoff_factor=0.2,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=settings.OAUTH_HTTP_POOL_SIZE,
+            max_retries=retry,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", settings.OAUTH_HTTP_TIMEOUT)
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            observe_provider(urlsplit(url).netloc, method.upper(), status, time.perf_counter() - start)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def provider_session():
+    """
+    The process-wide ProviderSession, created on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = ProviderSession()
+    return _session
@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from dggcrm.accounts.tokens import ServiceRefreshToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a refresh token for a bot or integration account. The client "
+        "exchanges it at /api/auth/token/refresh/ for access tokens."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"], is_active=True)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No active user {options['username']}")
+
+        self.stdout.write(str(ServiceRefreshToken.for_user(user)))
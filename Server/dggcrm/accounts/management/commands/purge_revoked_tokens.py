@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dggcrm.accounts.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = "Delete revoked token records for tokens that have expired anyway."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            jtis = list(
+                RevokedToken.objects
+                .filter(expires_at__lte=now)
+                .values_list("jti", flat=True)[:options["batch_size"]]
+            )
+            if not jtis:
+                break
+            deleted += RevokedToken.objects.filter(jti__in=jtis).delete()[0]
+
+        self.stdout.write(f"Deleted {deleted} expired revoked tokens")
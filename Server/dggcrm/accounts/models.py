@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class RevokedToken(models.Model):
+    """
+    A service token (by its jti claim) that must no longer be accepted,
+    either revoked explicitly or replaced by refresh token rotation.
+    Rows are only needed until the token would have expired anyway.
+    """
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "revoked_tokens"
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,171 @@
+"""
+Row-level access scoping.
+
+A user's role and scope are resolved once per request and compiled into
+queryset filters, so lists are restricted in SQL instead of checking each
+object. Membership is expressed as subqueries, so applying a scope adds no
+queries; resolving the role costs at most one, memoized for the request.
+
+Roles:
+  admin      superusers and staff, unrestricted
+  organizer  members of the ORGANIZER_GROUP group, unrestricted
+  volunteer  everyone else: the events they are a member of (UsersInEvent),
+             those events' members and participations, tickets for those
+             events or assigned to or reported by them, and the contacts
+             those participations and their assigned tickets refer to
+
+Writes are held to the same scope: ScopedRelatedFieldsMixin stops
+serializers linking rows to events, contacts or tickets outside it, and
+only organizers may add or remove event members, which would widen it.
+"""
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+from rest_framework.relations import RelatedField
+
+from dggcrm.contacts.models import Contact
+from dggcrm.events.models import Event, EventParticipation, UsersInEvent
+from dggcrm.tickets.models import Ticket
+
+
+class Role(models.TextChoices):
+    ADMIN = "admin", "Admin"
+    ORGANIZER = "organizer", "Organizer"
+    VOLUNTEER = "volunteer", "Volunteer"
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    user: object
+    role: str
+
+    @property
+    def unrestricted(self):
+        return self.role in (Role.ADMIN, Role.ORGANIZER)
+
+    def member_event_ids(self):
+        return UsersInEvent.objects.filter(user=self.user).values("event_id")
+
+    def filter(self, queryset):
+        """
+        `queryset` narrowed to the rows this scope may see.
+        """
+        if self.unrestricted:
+            return queryset
+
+        compile_scope = SCOPED_MODELS.get(queryset.model)
+        if compile_scope is None:
+            return queryset
+        return queryset.filter(compile_scope(self))
+
+
+def _event_filter(scope):
+    return Q(id__in=scope.member_event_ids())
+
+
+def _participation_filter(scope):
+    return Q(event_id__in=scope.member_event_ids())
+
+
+def _membership_filter(scope):
+    return Q(event_id__in=scope.member_event_ids())
+
+
+def _ticket_filter(scope):
+    return (
+        Q(event_id__in=scope.member_event_ids())
+        | Q(assigned_to=scope.user)
+        | Q(reported_by=scope.user)
+    )
+
+
+def _contact_filter(scope):
+    return (
+        Q(id__in=EventParticipation.objects.filter(_participation_filter(scope)).values("contact_id"))
+        | Q(id__in=Ticket.objects.filter(assigned_to=scope.user, contact__isnull=False).values("contact_id"))
+    )
+
+
+SCOPED_MODELS = {
+    Contact: _contact_filter,
+    Event: _event_filter,
+    EventParticipation: _participation_filter,
+    Ticket: _ticket_filter,
+    UsersInEvent: _membership_filter,
+}
+
+
+def resolve_role(user):
+    if not settings.ROW_LEVEL_SCOPING or user.is_superuser or user.is_staff:
+        return Role.ADMIN
+    if user.groups.filter(name=settings.ORGANIZER_GROUP).exists():
+        return Role.ORGANIZER
+    return Role.VOLUNTEER
+
+
+def access_scope(request):
+    """
+    The AccessScope for `request`'s user, resolved on first use and kept
+    on the underlying HttpRequest for the rest of the request.
+    """
+    http_request = getattr(request, "_request", request)
+    user = request.user
+
+    scope = getattr(http_request, "_access_scope", None)
+    if scope is None or scope.user.pk != user.pk:
+        scope = AccessScope(user=user, role=resolve_role(user))
+        http_request._access_scope = scope
+    return scope
+
+
+class ScopedQuerysetMixin:
+    """
+    ViewSet mixin restricting get_queryset() (and so lists, detail lookups
+    and writes to existing objects) to the request user's AccessScope.
+    """
+
+    def get_queryset(self):
+        return access_scope(self.request).filter(super().get_queryset())
+
+
+class ScopedRelatedFieldsMixin:
+    """
+    Serializer mixin restricting the objects its related fields accept to
+    the request user's AccessScope, so rows cannot be created in or moved
+    to events, contacts or tickets outside it.
+    """
+
+    def scope_queryset(self, queryset):
+        request = self.context.get("request")
+        if request is None:
+            return queryset
+        return access_scope(request).filter(queryset)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            field = getattr(field, "child_relation", field)
+            if isinstance(field, RelatedField) and field.queryset is not None:
+                field.queryset = self.scope_queryset(field.queryset)
+        return fields
+
+
+class IsOrganizer(BasePermission):
+    """
+    Allows admins and organizers only.
+    """
+
+    def has_permission(self, request, view):
+        return access_scope(request).unrestricted
+
+
+class IsOrganizerOrReadOnly(IsOrganizer):
+    """
+    Allows reads to everyone, writes to admins and organizers only.
+    """
+
+    def has_permission(self, request, view):
+        return request.method in SAFE_METHODS or super().has_permission(request, view)
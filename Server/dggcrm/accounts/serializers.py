@@ -2,6 +2,9 @@ from django.contrib.auth import get_user_model
 from allauth.account.models import EmailAddress
 from allauth.socialaccount.models import SocialAccount
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from .tokens import ServiceRefreshToken
 
 User = get_user_model()
 
@@ -38,3 +41,15 @@ class SocialAccountSerializer(serializers.ModelSerializer):
     class Meta:
         model = SocialAccount
         fields = ["id", "provider", "uid"]
+
+
+class ServiceTokenObtainSerializer(TokenObtainPairSerializer):
+    token_class = ServiceRefreshToken
+
+
+class ServiceTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ServiceRefreshToken
+
+
+class ServiceTokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
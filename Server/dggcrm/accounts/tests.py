@@ -0,0 +1,221 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from dggcrm.contacts.models import Contact
+from dggcrm.events.models import CommitmentStatus, Event, EventParticipation, UsersInEvent
+from dggcrm.events.views import UsersInEventViewSet
+from dggcrm.tickets.models import Ticket, TicketDependency, TicketStatus, TicketTemplate
+
+from .authentication import ServiceTokenAuthentication
+from .tokens import ServiceRefreshToken, revoked_access_tokens
+
+User = get_user_model()
+
+
+# Cached paths are opted into per test
+@override_settings(CURRENT_USER_CACHE_SECONDS=0)
+class ServiceTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="bot", password="unused")
+        refresh = ServiceRefreshToken.for_user(self.user)
+        self.refresh = str(refresh)
+        self.access = str(refresh.access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def get_user(self):
+        return self.client.get("/api/auth/user/")
+
+    def revoke(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/auth/token/revoke/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(response.status_code, 204)
+
+    def test_user_and_revocation_load_in_one_query(self):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        with self.assertNumQueries(1):
+            user, _ = ServiceTokenAuthentication().authenticate(Request(request))
+        self.assertEqual(user, self.user)
+
+    def test_revoked_token_is_refused(self):
+        self.revoke()
+        self.assertEqual(self.get_user().status_code, 401)
+
+    def test_deactivated_user_is_refused(self):
+        self.assertEqual(self.get_user().status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.get_user().status_code, 401)
+
+    @override_settings(CURRENT_USER_CACHE_SECONDS=60)
+    def test_cached_revocation_is_seen_by_other_workers(self):
+        # Another worker has loaded the revoked token list before
+        self.assertEqual(self.get_user().status_code, 200)
+        self.assertEqual(revoked_access_tokens(), frozenset())
+
+        self.revoke()
+        self.assertEqual(self.get_user().status_code, 401)
+
+    @override_settings(CURRENT_USER_CACHE_SECONDS=60)
+    def test_cached_user_is_dropped_when_deactivated(self):
+        self.assertEqual(self.get_user().status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.get_user().status_code, 401)
+
+
+@override_settings(ROW_LEVEL_SCOPING=True)
+class RowLevelScopingTests(TestCase):
+    """
+    A volunteer sees their own event's rows and nothing of another event,
+    whichever endpoint they go through.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.volunteer = User.objects.create_user(username="volunteer", password="unused")
+        cls.own_event = Event.objects.create(name="Own", starts_at=now, ends_at=now + timedelta(hours=2))
+        cls.other_event = Event.objects.create(name="Other", starts_at=now, ends_at=now + timedelta(hours=2))
+        UsersInEvent.objects.create(user=cls.volunteer, event=cls.own_event)
+
+        cls.own_contact = Contact.objects.create(full_name="Own Contact")
+        cls.other_contact = Contact.objects.create(full_name="Other Contact")
+        for event, contact in ((cls.own_event, cls.own_contact), (cls.other_event, cls.other_contact)):
+            EventParticipation.objects.create(event=event, contact=contact, status=CommitmentStatus.ATTENDED)
+
+        cls.own_ticket = Ticket.objects.create(
+            title="Call about the canvass", event=cls.own_event, contact=cls.own_contact,
+        )
+        cls.other_ticket = Ticket.objects.create(
+            title="Call about the canvass", event=cls.other_event, contact=cls.other_contact,
+            ticket_status=TicketStatus.COMPLETED,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.volunteer)
+
+    def test_similar_tickets(self):
+        response = self.client.get(
+            "/api/tickets/similar/", {"title": "Call about the canvass", "event": self.other_event.id},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+    def test_tickets_grouped_by_contact(self):
+        response = self.client.get("/api/tickets/group_by_contact/")
+        self.assertEqual(response.status_code, 200)
+        contacts = [row["contact_id"] for row in response.json()["results"]]
+        self.assertNotIn(self.other_contact.id, contacts)
+
+    def test_participations_grouped_by_contact(self):
+        response = self.client.get("/api/participants/group_by_contact/")
+        self.assertEqual(response.status_code, 200)
+        contacts = [row["contact_id"] for row in response.json()["results"]]
+        self.assertEqual(contacts, [self.own_contact.id])
+
+    def test_balance_is_for_organizers(self):
+        response = self.client.post(
+            "/api/tickets/balance/", {"tickets": [self.own_ticket.id], "users": [self.volunteer.id]}, format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.own_ticket.refresh_from_db()
+        self.assertIsNone(self.own_ticket.assigned_to)
+
+    def test_dependencies(self):
+        TicketDependency.objects.create(ticket=self.own_ticket, blocked_by=self.other_ticket)
+        response = self.client.get(f"/api/tickets/{self.own_ticket.id}/dependencies/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["blocked_by"], [])
+
+    def test_blocked(self):
+        TicketDependency.objects.create(ticket=self.other_ticket, blocked_by=self.own_ticket)
+        response = self.client.get(f"/api/tickets/{self.own_ticket.id}/blocked/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_ticket_create_outside_scope(self):
+        response = self.client.post("/api/tickets/", {"title": "Follow up", "event": self.other_event.id}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("event", response.json())
+
+        response = self.client.post("/api/tickets/", {"title": "Follow up", "event": self.own_event.id}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+    def test_participation_create_outside_scope(self):
+        response = self.client.post(
+            "/api/participants/", {"event": self.other_event.id, "contact": self.own_contact.id}, format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(EventParticipation.objects.filter(event=self.other_event, contact=self.own_contact).exists())
+
+    def test_generate_is_for_organizers(self):
+        response = self.client.post(
+            "/api/tickets/generate/",
+            {"ticket_type": "INTRODUCTION", "event": self.own_event.id, "participation_status": CommitmentStatus.ATTENDED},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_templates_are_changed_by_organizers(self):
+        template = TicketTemplate.objects.create(name="Canvass")
+        self.assertEqual(self.client.get("/api/ticket-templates/").status_code, 200)
+        self.assertEqual(self.client.post("/api/ticket-templates/", {"name": "Phonebank"}, format="json").status_code, 403)
+
+        response = self.client.post(
+            f"/api/ticket-templates/{template.id}/instantiate/", {"event": self.own_event.id}, format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(ROW_LEVEL_SCOPING=True)
+class EventMembershipTests(TestCase):
+    """
+    Event membership widens what a volunteer sees, so only organizers may
+    change it.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.volunteer = User.objects.create_user(username="volunteer", password="unused")
+        cls.organizer = User.objects.create_user(username="organizer", password="unused")
+        cls.organizer.groups.add(Group.objects.create(name="Organizers"))
+        cls.own_event = Event.objects.create(name="Own", starts_at=now, ends_at=now + timedelta(hours=2))
+        cls.other_event = Event.objects.create(name="Other", starts_at=now, ends_at=now + timedelta(hours=2))
+        UsersInEvent.objects.create(user=cls.volunteer, event=cls.own_event)
+        UsersInEvent.objects.create(user=cls.organizer, event=cls.other_event)
+
+    # The viewset is not routed, so it is called directly
+    def request(self, user, method, data=None, pk=None):
+        actions = {"get": "list", "post": "create"} if pk is None else {"delete": "destroy"}
+        request = getattr(APIRequestFactory(), method)("/", data, format="json")
+        force_authenticate(request, user)
+        return UsersInEventViewSet.as_view(actions)(request, pk=pk)
+
+    def test_volunteer_cannot_join_another_event(self):
+        response = self.request(self.volunteer, "post", {"user": self.volunteer.id, "event": self.other_event.id})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(UsersInEvent.objects.filter(user=self.volunteer, event=self.other_event).exists())
+
+    def test_volunteer_cannot_remove_members(self):
+        membership = UsersInEvent.objects.get(user=self.volunteer, event=self.own_event)
+        self.assertEqual(self.request(self.volunteer, "delete", pk=membership.pk).status_code, 403)
+
+    def test_volunteer_sees_only_their_events_members(self):
+        response = self.request(self.volunteer, "get")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["event"] for row in response.data["results"]], [self.own_event.id])
+
+    def test_organizer_adds_members(self):
+        response = self.request(self.organizer, "post", {"user": self.volunteer.id, "event": self.other_event.id})
+        self.assertEqual(response.status_code, 201)
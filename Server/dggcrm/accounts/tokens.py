@@ -0,0 +1,73 @@
+"""
+JWT tokens for bots and other service clients.
+
+Access tokens are short-lived. ServiceTokenAuthentication refuses revoked
+ones when it loads the user: in the same query, or, when
+CURRENT_USER_CACHE_SECONDS is set, from a list of revoked tokens kept in
+the shared cache and dropped whenever a token is revoked, so all workers
+see a revocation on their next request. Refresh tokens are rotated on use
+and checked against the database directly, so a replayed refresh token is
+always refused.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .models import RevokedToken
+
+DENYLIST_CACHE_KEY = "accounts:revoked_access_tokens"
+
+
+def revoked_access_tokens():
+    """
+    jtis of the revoked tokens that may still be unexpired access tokens,
+    from the shared cache when possible.
+    """
+    jtis = cache.get(DENYLIST_CACHE_KEY)
+    if jtis is None:
+        # Tokens outliving an access token's lifetime are refresh tokens;
+        # revocations after this load drop the cached list
+        now = timezone.now()
+        jtis = frozenset(
+            RevokedToken.objects
+            .filter(expires_at__gt=now, expires_at__lte=now + api_settings.ACCESS_TOKEN_LIFETIME)
+            .values_list("jti", flat=True)
+        )
+        cache.set(DENYLIST_CACHE_KEY, jtis, settings.CURRENT_USER_CACHE_SECONDS)
+    return jtis
+
+
+def revoke_token(token):
+    """
+    Stops `token` (an access or refresh token) from being accepted.
+    """
+    jti = token.payload[api_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token.payload["exp"], tz=dt_timezone.utc)
+    RevokedToken.objects.get_or_create(jti=jti, defaults={"expires_at": expires_at})
+    # After commit, so the list cannot be reloaded without it once dropped
+    transaction.on_commit(lambda: cache.delete(DENYLIST_CACHE_KEY))
+
+
+class ServiceAccessToken(AccessToken):
+    # Revocation is checked by ServiceTokenAuthentication.get_user
+    pass
+
+
+class ServiceRefreshToken(RefreshToken):
+    access_token_class = ServiceAccessToken
+
+    def verify(self):
+        super().verify()
+        if RevokedToken.objects.filter(jti=self.payload.get(api_settings.JTI_CLAIM)).exists():
+            raise TokenError(_("Token has been revoked"))
+
+    def blacklist(self):
+        # Called by TokenRefreshSerializer when it rotates this token
+        revoke_token(self)
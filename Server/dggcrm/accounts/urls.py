@@ -1,7 +1,16 @@
 from django.urls import path
-from .views import SocialConnectionDeleteView, CurrentUserView
+from .views import (
+    CurrentUserView,
+    ServiceTokenObtainView,
+    ServiceTokenRefreshView,
+    ServiceTokenRevokeView,
+    SocialConnectionDeleteView,
+)
 
 urlpatterns = [
     path("auth/social/connections/<str:provider>/", SocialConnectionDeleteView.as_view(), name="social_connection_delete"),
-    path("auth/user/", CurrentUserView.as_view(), name="current-user")
+    path("auth/user/", CurrentUserView.as_view(), name="current-user"),
+    path("auth/token/", ServiceTokenObtainView.as_view(), name="token-obtain"),
+    path("auth/token/refresh/", ServiceTokenRefreshView.as_view(), name="token-refresh"),
+    path("auth/token/revoke/", ServiceTokenRevokeView.as_view(), name="token-revoke"),
 ]
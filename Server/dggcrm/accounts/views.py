@@ -1,10 +1,23 @@
-from .serializers import SocialAccountSerializer, UserDetailsSerializer
+from dggcrm.db.mixins import TransactionPolicyMixin
+
+from .cache import current_user_payload
+from .serializers import (
+    ServiceTokenObtainSerializer,
+    ServiceTokenRefreshSerializer,
+    ServiceTokenRevokeSerializer,
+    SocialAccountSerializer,
+    UserDetailsSerializer,
+)
+from .tokens import ServiceAccessToken, ServiceRefreshToken, revoke_token
 from rest_framework import generics, permissions, status
 from allauth.socialaccount.models import SocialAccount
 from django.contrib.auth import get_user_model
+from django.utils.http import parse_etags
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 class SocialConnectionDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -14,12 +27,16 @@ class SocialConnectionDeleteView(generics.DestroyAPIView):
     def get_queryset(self):
         return SocialAccount.objects.filter(user=self.request.user)
 
-class CurrentUserView(APIView):
+class CurrentUserView(TransactionPolicyMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserDetailsSerializer(request.user)
-        return Response(serializer.data)
+        data, etag = current_user_payload(request.user)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(data, headers=headers)
 
     def patch(self, request):
         serializer = UserDetailsSerializer(
@@ -29,4 +46,49 @@ class CurrentUserView(APIView):
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ServiceTokenObtainView(TokenObtainPairView):
+    """
+    POST /api/auth/token/ {"username", "password"}
+    Access and refresh tokens for a bot or integration account.
+    """
+    serializer_class = ServiceTokenObtainSerializer
+
+
+class ServiceTokenRefreshView(TokenRefreshView):
+    """
+    POST /api/auth/token/refresh/ {"refresh"}
+    A new access token and a new refresh token; the old refresh token is
+    revoked, so each can only be used once.
+    """
+    serializer_class = ServiceTokenRefreshSerializer
+
+
+class ServiceTokenRevokeView(APIView):
+    """
+    POST /api/auth/token/revoke/ {"refresh"}
+    Revokes the refresh token and, when the request is authenticated with
+    one, the access token.
+    """
+    authentication_classes = []
+    permission_classes = []
+
+    def post(self, request):
+        serializer = ServiceTokenRevokeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            revoke_token(ServiceRefreshToken(serializer.validated_data["refresh"]))
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        header = request.headers.get("Authorization", "").split()
+        if len(header) == 2 and header[0] == "Bearer":
+            try:
+                revoke_token(ServiceAccessToken(header[1]))
+            except TokenError:
+                pass
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
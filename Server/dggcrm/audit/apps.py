@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "dggcrm.audit"
+    verbose_name = "CRM.audit"
+
+    def ready(self):
+        from . import buffer
+
+        buffer.connect_signals()
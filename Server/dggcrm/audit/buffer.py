@@ -0,0 +1,283 @@
+"""
+Batched audit log writing.
+
+When ``AUDITLOG_WRITE_MODE`` is ``"batched"``, saves made inside a
+``capture_audit()`` block skip django-auditlog's inline LogEntry insert.
+The diff is still computed in memory at save time, but the entries are
+written to the audit outbox with a single insert in the request
+transaction, and moved into LogEntry in batches after the response is
+sent (or by ``manage.py flush_audit_outbox``).
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from auditlog import get_logentry_model
+from auditlog.cid import get_cid
+from auditlog.context import disable_auditlog
+from auditlog.diff import model_instance_diff
+from auditlog.middleware import AuditlogMiddleware
+from auditlog.registry import auditlog
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.signals import request_finished
+from django.db import connection, transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.utils import timezone
+from django.utils.encoding import smart_str
+
+from .models import AuditOutbox
+
+_current_buffer = ContextVar("audit_buffer", default=None)
+_flush_state = threading.local()
+
+
+def batched_audit_enabled():
+    return settings.AUDITLOG_WRITE_MODE == "batched"
+
+
+class AuditBuffer:
+    """
+    Audit entries captured in memory during a single request.
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, instance, action, changes):
+        pk = instance.pk
+        try:
+            object_repr = smart_str(instance)
+        except ObjectDoesNotExist:
+            object_repr = "<error forming object repr>"
+
+        self.entries.append(AuditOutbox(
+            content_type=ContentType.objects.get_for_model(instance),
+            object_pk=smart_str(pk),
+            object_id=pk if isinstance(pk, int) else None,
+            object_repr=object_repr,
+            action=action,
+            changes=changes,
+            cid=get_cid(),
+            timestamp=timezone.now(),
+        ))
+
+    def write(self, actor=None, remote_addr=None, remote_port=None):
+        """
+        Writes the captured entries to the outbox in one insert and
+        schedules a flush once the surrounding transaction commits.
+        """
+        if not self.entries:
+            return []
+
+        for entry in self.entries:
+            entry.actor = actor
+            entry.actor_email = getattr(actor, "email", None)
+            entry.remote_addr = remote_addr
+            entry.remote_port = remote_port
+
+        written = AuditOutbox.objects.bulk_create(self.entries)
+        self.entries = []
+
+        ids = [entry.id for entry in written]
+        transaction.on_commit(lambda: _request_flush(ids))
+        return written
+
+
+@contextmanager
+def capture_audit():
+    """
+    Buffers audit entries for auditlog-registered models instead of
+    letting django-auditlog write them inline.
+    """
+    buffer = AuditBuffer()
+    token = _current_buffer.set(buffer)
+    try:
+        with disable_auditlog():
+            yield buffer
+    finally:
+        _current_buffer.reset(token)
+
+
+def audit_context(request):
+    """
+    Actor and client address for entries written on behalf of `request`.
+    """
+    user = getattr(request, "user", None)
+    return {
+        "actor": user if user is not None and user.is_authenticated else None,
+        "remote_addr": AuditlogMiddleware._get_remote_addr(request),
+        "remote_port": AuditlogMiddleware._get_remote_port(request),
+    }
+
+
+def _active_buffer(sender, raw):
+    buffer = _current_buffer.get()
+    if buffer is None or raw or not auditlog.contains(sender):
+        return None
+    return buffer
+
+
+def _capture_create(sender, instance, created, raw=False, **kwargs):
+    buffer = _active_buffer(sender, raw)
+    if buffer is None or not created:
+        return
+
+    changes = model_instance_diff(
+        None,
+        instance,
+        use_json_for_changes=settings.AUDITLOG_STORE_JSON_CHANGES,
+    )
+    buffer.add(instance, get_logentry_model().Action.CREATE, changes)
+
+
+def _capture_update(sender, instance, raw=False, update_fields=None, **kwargs):
+    buffer = _active_buffer(sender, raw)
+    if buffer is None or instance._state.adding or instance.pk is None:
+        return
+
+    old = sender._default_manager.filter(pk=instance.pk).first()
+    changes = model_instance_diff(
+        old,
+        instance,
+        fields_to_check=update_fields,
+        use_json_for_changes=settings.AUDITLOG_STORE_JSON_CHANGES,
+    )
+    if changes:
+        buffer.add(instance, get_logentry_model().Action.UPDATE, changes)
+
+
+def _capture_delete(sender, instance, **kwargs):
+    buffer = _active_buffer(sender, False)
+    if buffer is None or instance.pk is None:
+        return
+
+    changes = model_instance_diff(
+        instance,
+        None,
+        use_json_for_changes=settings.AUDITLOG_STORE_JSON_CHANGES,
+    )
+    buffer.add(instance, get_logentry_model().Action.DELETE, changes)
+
+
+def _request_flush(ids):
+    _flush_state.pending = [*getattr(_flush_state, "pending", []), *ids]
+
+
+def _flush_after_response(sender, **kwargs):
+    # Only move what this request wrote; the worker drains any backlog
+    ids = getattr(_flush_state, "pending", None)
+    if not ids:
+        return
+    _flush_state.pending = []
+    try:
+        flush_outbox(ids=ids)
+    finally:
+        # Django closed the request's connection before this ran, so the
+        # flush opened a new one that would otherwise idle until the next
+        # request
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+def connect_signals():
+    post_save.connect(_capture_create, dispatch_uid="audit_capture_create")
+    pre_save.connect(_capture_update, dispatch_uid="audit_capture_update")
+    post_delete.connect(_capture_delete, dispatch_uid="audit_capture_delete")
+    request_finished.connect(_flush_after_response, dispatch_uid="audit_flush_after_response")
+
+
+def flush_outbox(batch_size=None, max_batches=None, ids=None):
+    """
+    Moves pending outbox rows (only those in `ids`, if given) into
+    LogEntry, one bulk insert per batch. Batches are claimed with SKIP
+    LOCKED so several flushers can run at once.
+    Returns the number of entries flushed.
+    """
+    LogEntry = get_logentry_model()
+    batch_size = batch_size or settings.AUDITLOG_OUTBOX_BATCH_SIZE
+
+    pending = AuditOutbox.objects.all()
+    if ids is not None:
+        pending = pending.filter(id__in=ids)
+
+    flushed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            rows = list(
+                pending
+                .select_for_update(skip_locked=True)
+                .order_by("id")[:batch_size]
+            )
+            if not rows:
+                break
+
+            LogEntry.objects.bulk_create([row.to_log_entry(LogEntry) for row in rows])
+            AuditOutbox.objects.filter(id__in=[row.id for row in rows]).delete()
+
+        flushed += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+
+    return flushed
+
+
+def bulk_log(model, entries, action, actor=None, remote_addr=None, remote_port=None):
+    """
+    Records audit entries for changes made with set-based queries, which
+    bypass model signals. `entries` is an iterable of
+    ``(pk, object_repr, changes)`` tuples.
+
+    Everything is written with a single insert: into the active audit
+    buffer when there is one (its writer fills in the actor), otherwise
+    straight into LogEntry.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    cid = get_cid()
+    now = timezone.now()
+
+    rows = [
+        AuditOutbox(
+            content_type=content_type,
+            object_pk=smart_str(pk),
+            object_id=pk if isinstance(pk, int) else None,
+            object_repr=object_repr,
+            action=action,
+            changes=changes,
+            cid=cid,
+            timestamp=now,
+        )
+        for pk, object_repr, changes in entries
+    ]
+
+    buffer = _current_buffer.get()
+    if buffer is not None:
+        buffer.entries.extend(rows)
+        return rows
+
+    LogEntry = get_logentry_model()
+    for row in rows:
+        row.actor = actor
+        row.actor_email = getattr(actor, "email", None)
+        row.remote_addr = remote_addr
+        row.remote_port = remote_port
+    return LogEntry.objects.bulk_create([row.to_log_entry(LogEntry) for row in rows])
+
+
+def pending_entries_for(instance):
+    """
+    Outbox entries for `instance` that have not been flushed yet.
+    Readers merge these with LogEntry so a change is visible as soon as
+    its transaction commits.
+    """
+    return (
+        AuditOutbox.objects
+        .filter(
+            content_type=ContentType.objects.get_for_model(instance),
+            object_pk=smart_str(instance.pk),
+        )
+        .select_related("actor")
+    )
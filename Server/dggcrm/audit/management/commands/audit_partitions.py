@@ -0,0 +1,90 @@
+import json
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from dggcrm.audit import partitions
+
+
+class Command(BaseCommand):
+    help = "Manage the monthly partitions of the audit log and their archives."
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="action", required=True)
+
+        subparsers.add_parser("list", help="List audit log partitions")
+
+        ensure = subparsers.add_parser("ensure", help="Create partitions for upcoming months")
+        ensure.add_argument("--months-ahead", type=int, default=2)
+
+        archive = subparsers.add_parser(
+            "archive",
+            help="Detach partitions older than the retention window and archive them",
+        )
+        archive.add_argument("--older-than-months", type=int, default=settings.AUDITLOG_RETENTION_MONTHS)
+        archive.add_argument("--dir", default=settings.AUDITLOG_ARCHIVE_DIR)
+
+        restore = subparsers.add_parser("restore", help="Re-attach an archived partition")
+        restore.add_argument("path", help="Archive .csv.gz file or its .json manifest")
+
+        query = subparsers.add_parser("query", help="Print entries from an archive as JSON lines")
+        query.add_argument("path", help="Archive .csv.gz file or its .json manifest")
+        query.add_argument(
+            "--model",
+            help="Limit to a model, e.g. tickets.ticket, or its content type id (needs no database)",
+        )
+        query.add_argument("--object-pk", help="Limit to a single object")
+
+    def handle(self, *args, **options):
+        action = options["action"]
+
+        # Archives can be read without a database, unless --model names a
+        # model whose content type has to be looked up
+        if action == "query":
+            return self.query(options)
+
+        if not partitions.is_partitioned():
+            raise CommandError("The audit log is not partitioned (PostgreSQL only, see audit migration 0002)")
+
+        getattr(self, action)(options)
+
+    def list(self, options):
+        for partition in partitions.list_partitions():
+            lower = partition.lower.date() if partition.lower else "-"
+            upper = partition.upper.date() if partition.upper else "-"
+            self.stdout.write(f"{partition.name}\t{lower}\t{upper}")
+
+    def ensure(self, options):
+        for partition in partitions.ensure_partitions(options["months_ahead"]):
+            self.stdout.write(f"Created {partition.name}")
+
+    def archive(self, options):
+        current = partitions.month_start(timezone.now())
+        cutoff = partitions.add_months(current, -options["older_than_months"])
+        for path in partitions.archive_before(cutoff, options["dir"]):
+            self.stdout.write(f"Archived to {path}")
+
+    def restore(self, options):
+        partition = partitions.restore_archive(options["path"])
+        self.stdout.write(f"Attached {partition.name}")
+
+    def query(self, options):
+        content_type_id = None
+        if options["model"] and options["model"].isdigit():
+            content_type_id = int(options["model"])
+        elif options["model"]:
+            app_label, _, model = options["model"].lower().partition(".")
+            try:
+                content_type_id = ContentType.objects.get_by_natural_key(app_label, model).id
+            except ContentType.DoesNotExist:
+                raise CommandError(f"Unknown model {options['model']}")
+
+        rows = partitions.query_archive(
+            options["path"],
+            content_type_id=content_type_id,
+            object_pk=options["object_pk"],
+        )
+        for row in rows:
+            self.stdout.write(json.dumps(row))
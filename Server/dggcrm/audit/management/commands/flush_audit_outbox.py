@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dggcrm.audit.buffer import flush_outbox
+
+
+class Command(BaseCommand):
+    help = "Move pending audit outbox entries into the audit log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and flush every --interval seconds",
+        )
+        parser.add_argument("--interval", type=float, default=2.0)
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = flush_outbox(batch_size=options["batch_size"])
+            if flushed:
+                self.stdout.write(f"Flushed {flushed} audit entries")
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
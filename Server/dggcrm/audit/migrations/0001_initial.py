@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditOutbox',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_pk', models.CharField(max_length=255)),
+                ('object_id', models.BigIntegerField(blank=True, null=True)),
+                ('object_repr', models.TextField()),
+                ('action', models.PositiveSmallIntegerField()),
+                ('changes', models.JSONField(null=True)),
+                ('actor_email', models.CharField(blank=True, max_length=254, null=True)),
+                ('cid', models.CharField(blank=True, max_length=255, null=True)),
+                ('remote_addr', models.GenericIPAddressField(blank=True, null=True)),
+                ('remote_port', models.PositiveIntegerField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField()),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'db_table': 'audit_outbox',
+                'indexes': [models.Index(fields=['content_type', 'object_pk'], name='audit_outbo_content_ce24a3_idx')],
+            },
+        ),
+    ]
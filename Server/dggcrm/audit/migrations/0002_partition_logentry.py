@@ -0,0 +1,138 @@
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+def next_month_start(now):
+    start = now.astimezone(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_logentry(apps, schema_editor):
+    """
+    Turns auditlog_logentry into a table range partitioned by month on
+    "timestamp". Existing rows stay in place as the legacy partition.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    user_table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    legacy_upper = next_month_start(timezone.now())
+    following = next_month_start(legacy_upper)
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM auditlog_logentry")
+        (max_id,) = cursor.fetchone()
+
+        # A partition may not own an identity column or sequence
+        cursor.execute("ALTER TABLE auditlog_logentry RENAME TO auditlog_logentry_legacy")
+        cursor.execute("ALTER TABLE auditlog_logentry_legacy ALTER COLUMN id DROP IDENTITY IF EXISTS")
+        cursor.execute("ALTER TABLE auditlog_logentry_legacy ALTER COLUMN id DROP DEFAULT")
+        # Its primary key on (id) would clash with the parent's on
+        # (id, timestamp), which attaching adds to it
+        cursor.execute("ALTER TABLE auditlog_logentry_legacy DROP CONSTRAINT auditlog_logentry_pkey")
+
+        cursor.execute(
+            """
+            CREATE TABLE auditlog_logentry
+            (LIKE auditlog_logentry_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+            PARTITION BY RANGE ("timestamp")
+            """
+        )
+        cursor.execute("CREATE SEQUENCE auditlog_logentry_partitioned_id_seq OWNED BY auditlog_logentry.id")
+        cursor.execute("SELECT setval('auditlog_logentry_partitioned_id_seq', %s, false)", [max_id + 1])
+        cursor.execute(
+            "ALTER TABLE auditlog_logentry "
+            "ALTER COLUMN id SET DEFAULT nextval('auditlog_logentry_partitioned_id_seq')"
+        )
+
+        # The partition key has to be part of the primary key
+        cursor.execute('ALTER TABLE auditlog_logentry ADD PRIMARY KEY (id, "timestamp")')
+        cursor.execute(
+            "CREATE INDEX auditlog_logentry_object_ts_idx "
+            'ON auditlog_logentry (content_type_id, object_pk, "timestamp")'
+        )
+        cursor.execute('CREATE INDEX auditlog_logentry_ts_idx ON auditlog_logentry ("timestamp")')
+        cursor.execute("CREATE INDEX auditlog_logentry_actor_idx ON auditlog_logentry (actor_id)")
+        cursor.execute(
+            "ALTER TABLE auditlog_logentry ADD FOREIGN KEY (content_type_id) "
+            "REFERENCES django_content_type (id) DEFERRABLE INITIALLY DEFERRED"
+        )
+        cursor.execute(
+            f"ALTER TABLE auditlog_logentry ADD FOREIGN KEY (actor_id) "
+            f"REFERENCES {schema_editor.quote_name(user_table)} (id) DEFERRABLE INITIALLY DEFERRED"
+        )
+
+        cursor.execute(
+            "ALTER TABLE auditlog_logentry ATTACH PARTITION auditlog_logentry_legacy "
+            f"FOR VALUES FROM (MINVALUE) TO ('{legacy_upper.isoformat()}')"
+        )
+        cursor.execute(
+            f"CREATE TABLE auditlog_logentry_y{legacy_upper.year}m{legacy_upper.month:02d} "
+            "PARTITION OF auditlog_logentry "
+            f"FOR VALUES FROM ('{legacy_upper.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        cursor.execute("CREATE TABLE auditlog_logentry_default PARTITION OF auditlog_logentry DEFAULT")
+
+
+
+def unpartition_logentry(apps, schema_editor):
+    """
+    Turns auditlog_logentry back into a plain table: every row is moved
+    into the legacy partition, which becomes the table again. Archived
+    partitions are not restored.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("ALTER TABLE auditlog_logentry DETACH PARTITION auditlog_logentry_legacy")
+        cursor.execute("INSERT INTO auditlog_logentry_legacy SELECT * FROM auditlog_logentry")
+        # Also drops the other partitions and the id sequence
+        cursor.execute("DROP TABLE auditlog_logentry")
+
+        # Constraints and indexes the legacy table inherited from the parent
+        cursor.execute(
+            """
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = 'auditlog_logentry_legacy'::regclass AND contype = 'p'
+            """
+        )
+        for (name,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE auditlog_logentry_legacy DROP CONSTRAINT {schema_editor.quote_name(name)}")
+        cursor.execute(
+            """
+            SELECT indexrelid::regclass::text FROM pg_index
+            WHERE indrelid = 'auditlog_logentry_legacy'::regclass
+              AND pg_get_indexdef(indexrelid) LIKE '%%(content_type_id, object_pk, "timestamp")'
+            """
+        )
+        for (name,) in cursor.fetchall():
+            cursor.execute(f"DROP INDEX {name}")
+
+        cursor.execute("ALTER TABLE auditlog_logentry_legacy RENAME TO auditlog_logentry")
+        cursor.execute("ALTER TABLE auditlog_logentry ADD CONSTRAINT auditlog_logentry_pkey PRIMARY KEY (id)")
+        cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM auditlog_logentry")
+        (next_id,) = cursor.fetchone()
+        cursor.execute(
+            "ALTER TABLE auditlog_logentry ALTER COLUMN id "
+            f"ADD GENERATED BY DEFAULT AS IDENTITY (START WITH {int(next_id)})"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0001_initial"),
+        ("auditlog", "0017_add_actor_email"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_logentry, unpartition_logentry),
+    ]
@@ -0,0 +1,25 @@
+from django.db import transaction
+
+from .buffer import audit_context, batched_audit_enabled, capture_audit
+
+
+class BufferedAuditMixin:
+    """
+    ViewSet mixin that routes audit entries for writes made by the view
+    through the audit outbox when AUDITLOG_WRITE_MODE is "batched".
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not batched_audit_enabled():
+            return super().dispatch(request, *args, **kwargs)
+
+        with capture_audit() as buffer:
+            response = super().dispatch(request, *args, **kwargs)
+
+            # Still inside the ATOMIC_REQUESTS transaction here, unless the
+            # view failed and marked it for rollback
+            connection = transaction.get_connection()
+            if buffer.entries and not (connection.in_atomic_block and connection.needs_rollback):
+                buffer.write(**audit_context(self.request))
+
+        return response
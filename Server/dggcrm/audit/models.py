@@ -0,0 +1,65 @@
+from django.db import models
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+
+
+class AuditOutbox(models.Model):
+    """
+    Audit log entry captured during a request and waiting to be moved
+    into auditlog's LogEntry table.
+    Rows are written in the same transaction as the change they describe,
+    so an entry is never lost or recorded for a rolled back write.
+    """
+    id = models.BigAutoField(primary_key=True)
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    object_pk = models.CharField(max_length=255)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    object_repr = models.TextField()
+
+    # Same values as auditlog's LogEntry.Action
+    action = models.PositiveSmallIntegerField()
+    changes = models.JSONField(null=True)
+
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    actor_email = models.CharField(max_length=254, null=True, blank=True)
+    cid = models.CharField(max_length=255, null=True, blank=True)
+    remote_addr = models.GenericIPAddressField(null=True, blank=True)
+    remote_port = models.PositiveIntegerField(null=True, blank=True)
+
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        db_table = "audit_outbox"
+        indexes = [
+            models.Index(fields=["content_type", "object_pk"]),
+        ]
+
+    def __str__(self):
+        return f"Pending audit for {self.object_repr}"
+
+    def to_log_entry(self, log_entry_model):
+        return log_entry_model(
+            content_type_id=self.content_type_id,
+            object_pk=self.object_pk,
+            object_id=self.object_id,
+            object_repr=self.object_repr,
+            action=self.action,
+            changes=self.changes,
+            actor_id=self.actor_id,
+            actor_email=self.actor_email,
+            cid=self.cid,
+            remote_addr=self.remote_addr,
+            remote_port=self.remote_port,
+            timestamp=self.timestamp,
+        )
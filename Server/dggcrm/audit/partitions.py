@@ -0,0 +1,273 @@
+"""
+Monthly range partitions for auditlog's LogEntry table (PostgreSQL only).
+
+Migration 0002 turns ``auditlog_logentry`` into a table partitioned on
+``timestamp``. Rows that existed before that live on in the
+``auditlog_logentry_legacy`` partition, each later month gets its own
+partition and a default partition catches anything outside those ranges.
+
+Old partitions can be archived to gzipped CSV files, which can be queried
+directly or attached again with ``manage.py audit_partitions``.
+"""
+import csv
+import gzip
+import json
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+PARENT_TABLE = "auditlog_logentry"
+DEFAULT_TABLE = f"{PARENT_TABLE}_default"
+
+Partition = namedtuple("Partition", ["name", "lower", "upper"])
+
+_RANGE_BOUND = re.compile(r"FROM \((.+)\) TO \((.+)\)")
+
+
+def month_start(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value, months):
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def partition_name(lower):
+    return f"{PARENT_TABLE}_y{lower.year}m{lower.month:02d}"
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def _parse_bound(value):
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    return parse_datetime(value.strip("'"))
+
+
+def _bound_sql(value, unbounded):
+    return unbounded if value is None else f"'{value.isoformat()}'"
+
+
+def list_partitions():
+    """
+    Range partitions of the audit log, oldest first.
+    The default partition is not included.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [PARENT_TABLE],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = _RANGE_BOUND.search(bound)
+        if match is None:
+            continue
+        partitions.append(Partition(name, _parse_bound(match[1]), _parse_bound(match[2])))
+
+    partitions.sort(key=lambda p: (p.lower is not None, p.lower))
+    return partitions
+
+
+def _covers(partition, moment):
+    return (
+        (partition.lower is None or partition.lower <= moment)
+        and (partition.upper is None or moment < partition.upper)
+    )
+
+
+def create_partition(lower):
+    """
+    Creates and attaches the partition for the month starting at `lower`.
+    Rows for that month that already landed in the default partition are
+    moved into it.
+    """
+    upper = add_months(lower, 1)
+    name = partition_name(lower)
+    qn = connection.ops.quote_name
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} "
+            f"(LIKE {qn(PARENT_TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {qn(DEFAULT_TABLE)}
+                WHERE "timestamp" >= %s AND "timestamp" < %s
+                RETURNING *
+            )
+            INSERT INTO {qn(name)} SELECT * FROM moved
+            """,
+            [lower, upper],
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(PARENT_TABLE)} ATTACH PARTITION {qn(name)} "
+            f"FOR VALUES FROM ({_bound_sql(lower, 'MINVALUE')}) TO ({_bound_sql(upper, 'MAXVALUE')})"
+        )
+
+    return Partition(name, lower, upper)
+
+
+def ensure_partitions(months_ahead):
+    """
+    Makes sure the current month and the next `months_ahead` months have
+    a partition. Returns the partitions that were created.
+    """
+    existing = list_partitions()
+    current = month_start(timezone.now())
+
+    created = []
+    for offset in range(months_ahead + 1):
+        lower = add_months(current, offset)
+        if not any(_covers(partition, lower) for partition in existing):
+            created.append(create_partition(lower))
+    return created
+
+
+def _manifest_path(data_path):
+    return data_path.with_name(data_path.name.removesuffix(".csv.gz") + ".json")
+
+
+def _row_count(cursor, name):
+    cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(name)}")
+    return cursor.fetchone()[0]
+
+
+def archive_partition(partition, directory):
+    """
+    Copies a partition to ``<directory>/<name>.csv.gz`` with a JSON manifest
+    next to it, then detaches and drops it.
+
+    The copy runs before the detach so inserts into the audit log are only
+    blocked for the short detach/drop at the end.
+    """
+    qn = connection.ops.quote_name
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    data_path = directory / f"{partition.name}.csv.gz"
+    tmp_path = data_path.with_name(data_path.name + ".tmp")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = %s ORDER BY ordinal_position
+            """,
+            [partition.name],
+        )
+        columns = [row[0] for row in cursor.fetchall()]
+        rows = _row_count(cursor, partition.name)
+
+        with gzip.open(tmp_path, "wb") as out:
+            with cursor.copy(f"COPY {qn(partition.name)} TO STDOUT (FORMAT csv, HEADER)") as copy:
+                for chunk in copy:
+                    out.write(chunk)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(PARENT_TABLE)} DETACH PARTITION {qn(partition.name)}")
+        if _row_count(cursor, partition.name) != rows:
+            # Something wrote into the month while it was being copied
+            raise RuntimeError(f"{partition.name} changed while archiving, try again")
+        cursor.execute(f"DROP TABLE {qn(partition.name)}")
+
+    tmp_path.rename(data_path)
+    _manifest_path(data_path).write_text(json.dumps({
+        "table": partition.name,
+        "parent": PARENT_TABLE,
+        "lower": partition.lower.isoformat() if partition.lower else None,
+        "upper": partition.upper.isoformat() if partition.upper else None,
+        "columns": columns,
+        "rows": rows,
+        "archived_at": timezone.now().isoformat(),
+    }, indent=2))
+
+    return data_path
+
+
+def archive_before(cutoff, directory):
+    """
+    Archives every partition that only holds entries older than `cutoff`.
+    """
+    return [
+        archive_partition(partition, directory)
+        for partition in list_partitions()
+        if partition.upper is not None and partition.upper <= cutoff
+    ]
+
+
+def load_manifest(path):
+    path = Path(path)
+    if path.suffix == ".json":
+        manifest_path = path
+        data_path = path.with_name(path.stem + ".csv.gz")
+    else:
+        data_path = path
+        manifest_path = _manifest_path(path)
+    return data_path, json.loads(manifest_path.read_text())
+
+
+def restore_archive(path):
+    """
+    Loads an archived partition back into the database and attaches it.
+    """
+    data_path, manifest = load_manifest(path)
+    qn = connection.ops.quote_name
+    name = manifest["table"]
+    lower = parse_datetime(manifest["lower"]) if manifest["lower"] else None
+    upper = parse_datetime(manifest["upper"]) if manifest["upper"] else None
+    columns = ", ".join(qn(column) for column in manifest["columns"])
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} "
+            f"(LIKE {qn(PARENT_TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        with cursor.copy(f"COPY {qn(name)} ({columns}) FROM STDIN (FORMAT csv, HEADER)") as copy:
+            with gzip.open(data_path, "rb") as source:
+                while chunk := source.read(1 << 16):
+                    copy.write(chunk)
+        cursor.execute(
+            f"ALTER TABLE {qn(PARENT_TABLE)} ATTACH PARTITION {qn(name)} "
+            f"FOR VALUES FROM ({_bound_sql(lower, 'MINVALUE')}) TO ({_bound_sql(upper, 'MAXVALUE')})"
+        )
+
+    return Partition(name, lower, upper)
+
+
+def query_archive(path, content_type_id=None, object_pk=None):
+    """
+    Streams rows out of an archive file without loading it into the
+    database, optionally filtered to a single object.
+    """
+    data_path, _ = load_manifest(path)
+    with gzip.open(data_path, "rt", newline="") as source:
+        for row in csv.DictReader(source):
+            if content_type_id is not None and row["content_type_id"] != str(content_type_id):
+                continue
+            if object_pk is not None and row["object_pk"] != str(object_pk):
+                continue
+            yield row
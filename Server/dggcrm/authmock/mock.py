@@ -1,7 +1,8 @@
-import requests
 from allauth.socialaccount.providers.oauth2.provider import OAuth2Provider
 from allauth.socialaccount.providers.oauth2.views import OAuth2Adapter, OAuth2LoginView, OAuth2CallbackView
 
+from dggcrm.accounts.http import provider_session
+
 
 class BaseMockOAuth2Adapter(OAuth2Adapter):
     """
@@ -11,14 +12,12 @@ class BaseMockOAuth2Adapter(OAuth2Adapter):
 
     def complete_login(self, request, app, token, **kwargs):
         # Fetch user info from the mock provider
-        resp = requests.get(
+        resp = provider_session().get(
             self.profile_url,
             headers={"Authorization": f"Bearer {token.token}"},
-            timeout=5,
         )
         resp.raise_for_status()
         extra_data = resp.json()
-        print(f"USER INFO ({self.provider_id})", extra_data, flush=True)
         return self.get_provider().sociallogin_from_response(request, extra_data)
 
 
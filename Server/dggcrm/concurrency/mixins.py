@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The object was modified since it was read. Reload it and try again."
+    default_code = "precondition_failed"
+
+
+def object_etag(obj):
+    """
+    Strong ETag for `obj`, derived from its modified_at.
+    """
+    return quote_etag(f"{(obj.modified_at - EPOCH) // timedelta(microseconds=1):x}")
+
+
+class ConditionalUpdateMixin:
+    """
+    ViewSet mixin for optimistic concurrency on models with an auto_now
+    modified_at. Detail responses carry an ETag; PUT and PATCH requests
+    with If-Match only go ahead if the object still has that ETag.
+
+    The check is a conditional ``UPDATE ... WHERE modified_at = ?``, so of
+    two writers racing with the same ETag exactly one wins and the other
+    gets 412, without locking the row on read.
+    """
+    etag_actions = ("retrieve", "update", "partial_update")
+
+    def get_object(self):
+        obj = super().get_object()
+        if self.action in self.etag_actions:
+            self._etag_object = obj
+
+        if_match = self.request.headers.get("If-Match")
+        if if_match is None or self.request.method not in ("PUT", "PATCH"):
+            return obj
+
+        etags = parse_etags(if_match)
+        if etags == ["*"]:
+            return obj
+        if object_etag(obj) not in etags:
+            raise PreconditionFailed()
+
+        claimed = (
+            type(obj)._default_manager
+            .filter(pk=obj.pk, modified_at=obj.modified_at)
+            .update(modified_at=timezone.now())
+        )
+        if not claimed:
+            raise PreconditionFailed()
+        return obj
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        obj = getattr(self, "_etag_object", None)
+        if obj is not None and status.is_success(response.status_code):
+            # modified_at was refreshed in memory if the view saved obj
+            response["ETag"] = object_etag(obj)
+        return response
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from dggcrm.contacts.models import Contact
+
+User = get_user_model()
+
+
+class ConditionalUpdateMixinTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="organizer", password="unused", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.contact = Contact.objects.create(full_name="Jane Doe")
+        self.url = f"/api/contacts/{self.contact.id}/"
+
+    def patch(self, data, etag):
+        return self.client.patch(self.url, data, format="json", HTTP_IF_MATCH=etag)
+
+    def test_update_with_current_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.patch({"full_name": "Jane Smith"}, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.url)["ETag"], response["ETag"])
+
+    def test_update_with_stale_etag(self):
+        stale = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.patch({"full_name": "Jane Smith"}, stale).status_code, 200)
+
+        response = self.patch({"full_name": "Jane Roe"}, stale)
+        self.assertEqual(response.status_code, 412)
+        self.assertFalse(response.has_header("ETag"))
+        self.contact.refresh_from_db()
+        self.assertEqual(self.contact.full_name, "Jane Smith")
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from dggcrm.accounts.scopes import ScopedRelatedFieldsMixin
+
 from .models import Contact, Tag, TagAssignments
 
 
@@ -35,7 +37,7 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'modified_at']
 
 
-class TagAssignmentSerializer(serializers.ModelSerializer):
+class TagAssignmentSerializer(ScopedRelatedFieldsMixin, serializers.ModelSerializer):
     contact_id = serializers.PrimaryKeyRelatedField(
         queryset=Contact.objects.all(),
         source="contact",
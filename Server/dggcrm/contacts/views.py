@@ -3,6 +3,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from django.db.models import Q
 
+from dggcrm.accounts.scopes import ScopedQuerysetMixin
+from dggcrm.concurrency.mixins import ConditionalUpdateMixin
+from dggcrm.db.mixins import TransactionPolicyMixin
+from dggcrm.idempotency.mixins import IdempotentMixin
+
 from .models import Contact, Tag, TagAssignments
 from .serializers import (
     ContactSerializer,
@@ -11,7 +16,7 @@ from .serializers import (
 )
 
 # TODO: Add permission_classes to these views
-class ContactViewSet(viewsets.ModelViewSet):
+class ContactViewSet(TransactionPolicyMixin, IdempotentMixin, ConditionalUpdateMixin, ScopedQuerysetMixin, viewsets.ModelViewSet):
     queryset = (
         Contact.objects
         .all()
@@ -64,11 +69,11 @@ class ContactViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(TransactionPolicyMixin, IdempotentMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
 
-class TagAssignmentViewSet(viewsets.ModelViewSet):
+class TagAssignmentViewSet(TransactionPolicyMixin, IdempotentMixin, viewsets.ModelViewSet):
     serializer_class = TagAssignmentSerializer
     queryset = TagAssignments.objects.all()
 
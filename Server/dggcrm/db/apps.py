@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class DbConfig(AppConfig):
+    name = "dggcrm.db"
+    verbose_name = "CRM.db"
+
+    def ready(self):
+        from . import checks  # noqa: F401
@@ -0,0 +1,20 @@
+import time
+
+from django.db.backends.postgresql import base
+
+from dggcrm.db.pool import checkout_times
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Django's PostgreSQL backend, timing checkouts from the connection pool.
+    """
+
+    def get_new_connection(self, conn_params):
+        if self.pool is None:
+            return super().get_new_connection(conn_params)
+
+        started = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        checkout_times.record(self.alias, time.perf_counter() - started)
+        return connection
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core import checks
+
+from .routers import replica_configured
+
+
+@checks.register(checks.Tags.caches)
+def check_sticky_cache(app_configs, **kwargs):
+    """
+    Stickiness after a write is kept in the default cache, and the user's
+    next read is usually served by another worker.
+    """
+    if not replica_configured():
+        return []
+    if settings.CACHES["default"]["BACKEND"] != "django.core.cache.backends.locmem.LocMemCache":
+        return []
+    return [
+        checks.Error(
+            "A read replica is configured but the default cache is local to each process.",
+            hint="Set CACHE_URL to a cache shared by all workers (e.g. redis://cache:6379/0), "
+                 "or users may not see their own writes.",
+            id="db.E001",
+        )
+    ]
@@ -0,0 +1,7 @@
+from django.core.management.commands import shell
+
+
+class Command(shell.Command):
+    def get_auto_imports(self):
+        # pool_stats() reports this process's database connection pools
+        return [*super().get_auto_imports(), "dggcrm.db.pool.pool_stats"]
@@ -0,0 +1,32 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.permissions import SAFE_METHODS
+
+from .routers import mark_sticky, replica_reads
+
+
+class TransactionPolicyMixin:
+    """
+    View mixin that replaces ATOMIC_REQUESTS for the view: safe methods run
+    in autocommit with reads routed to the replica (if configured), other
+    methods run in a transaction on the primary as before.
+
+    Must come first in the view's bases so its transaction also covers
+    the other mixins' dispatch work.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        return transaction.non_atomic_requests(super().as_view(*args, **kwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            with replica_reads(self):
+                return super().dispatch(request, *args, **kwargs)
+
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            response = super().dispatch(request, *args, **kwargs)
+
+        if response.status_code < 400:
+            # self.request is the authenticated DRF request by now
+            mark_sticky(self.request.user)
+        return response
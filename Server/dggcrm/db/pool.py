@@ -0,0 +1,107 @@
+"""
+Pooled PostgreSQL connections.
+
+Each process keeps a psycopg_pool pool per database alias instead of
+opening a new connection for every request. Connections are checked
+before they are handed out, so ones dropped by the server or a proxy are
+replaced rather than failing the request.
+"""
+import threading
+
+from django.db import connections
+
+ENGINE = "dggcrm.db.backends.postgresql"
+
+# psycopg_pool.ConnectionPool arguments, overridable with pool_* options on
+# the database URL (e.g. ?pool_max_size=20 sets max_size)
+POOL_DEFAULTS = {
+    "min_size": 2,
+    "max_size": 10,
+    # Seconds a request waits for a free connection before failing
+    "timeout": 10.0,
+    # Seconds before idle connections above min_size are closed
+    "max_idle": 300.0,
+    # Seconds before a connection is replaced, whatever its use
+    "max_lifetime": 1800.0,
+}
+
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def pooled(database):
+    """
+    Turns a PostgreSQL entry from env.db() into a pooled one, taking the
+    pool settings out of its OPTIONS. ``?pool=false`` keeps one connection
+    per request; other engines are returned unchanged.
+    """
+    if database["ENGINE"] != "django.db.backends.postgresql":
+        return database
+
+    options = dict(database.get("OPTIONS", {}))
+    enabled = str(options.pop("pool", "true")).lower() not in _FALSE_VALUES
+
+    pool = dict(POOL_DEFAULTS)
+    for name, default in POOL_DEFAULTS.items():
+        if f"pool_{name}" in options:
+            pool[name] = type(default)(options.pop(f"pool_{name}"))
+
+    if not enabled:
+        return {**database, "OPTIONS": options}
+
+    return {
+        **database,
+        "ENGINE": ENGINE,
+        "OPTIONS": {**options, "pool": pool},
+        # Pooled connections are returned after every request instead
+        "CONN_MAX_AGE": 0,
+        # Validate connections as they are checked out of the pool
+        "CONN_HEALTH_CHECKS": True,
+    }
+
+
+class _CheckoutTimes:
+    """
+    How long taking a connection out of each alias's pool has taken in this
+    process, including the wait for a free one and its health check.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._times = {}
+
+    def record(self, alias, seconds):
+        with self._lock:
+            count, total, slowest = self._times.get(alias, (0, 0.0, 0.0))
+            self._times[alias] = (count + 1, total + seconds, max(slowest, seconds))
+
+    def get(self, alias):
+        with self._lock:
+            return self._times.get(alias, (0, 0.0, 0.0))
+
+
+checkout_times = _CheckoutTimes()
+
+
+def pool_stats():
+    """
+    Usage of this process's connection pools, by database alias: psycopg_pool's
+    own counters (see ConnectionPool.get_stats()) plus checkout latency.
+    Databases that are not pooled are left out.
+    """
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            continue
+
+        data = pool.get_stats()
+        count, total, slowest = checkout_times.get(alias)
+        queued = data.get("requests_queued", 0)
+        data.update(
+            checkouts=count,
+            checkout_ms_avg=round(1000 * total / count, 3) if count else 0.0,
+            checkout_ms_max=round(1000 * slowest, 3),
+            requests_wait_ms_avg=round(data.get("requests_wait_ms", 0) / queued, 3) if queued else 0.0,
+        )
+        stats[alias] = data
+    return stats
@@ -0,0 +1,141 @@
+"""
+Read replica routing.
+
+Reads of the CRM's own models made while serving a safe-method API
+request (see TransactionPolicyMixin) go to the "replica" alias when one
+is configured. Everything else (writes, sessions, users, and any read
+outside such a request) uses the primary.
+
+Reads fall back to the primary for REPLICA_STICKY_SECONDS after the user's
+own write, so they see their change, and for everyone while the replica
+lags more than REPLICA_MAX_LAG_SECONDS behind. Stickiness is kept in the
+default cache, which must be shared by all workers (see db.checks).
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+REPLICA_DB_ALIAS = "replica"
+
+# Apps whose reads may be served from the replica
+REPLICA_APPS = {"contacts", "events", "tickets"}
+
+_read_routing = ContextVar("read_routing", default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def _sticky_key(user_id):
+    return f"db:sticky:{user_id}"
+
+
+def mark_sticky(user):
+    """
+    Sends `user`'s reads to the primary for the next REPLICA_STICKY_SECONDS.
+    """
+    if replica_configured() and user.is_authenticated:
+        # Rounded up: the Redis backend truncates timeouts to whole seconds,
+        # and a timeout of 0 would not store the key at all
+        cache.set(_sticky_key(user.pk), True, math.ceil(settings.REPLICA_STICKY_SECONDS))
+
+
+class _LagMonitor:
+    """
+    Replication lag of the replica, measured at most every few seconds per
+    process. Only PostgreSQL standbys report lag; others count as caught up.
+    """
+    interval = 5.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._lag = 0.0
+
+    def lag(self):
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at > self.interval:
+            with self._lock:
+                self._lag = self._measure()
+                self._checked_at = now
+        return self._lag
+
+    def _measure(self):
+        connection = connections[REPLICA_DB_ALIAS]
+        if connection.vendor != "postgresql":
+            return 0.0
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT CASE WHEN pg_is_in_recovery() "
+                    "THEN extract(epoch FROM now() - pg_last_xact_replay_timestamp()) "
+                    "ELSE 0 END"
+                )
+                lag = cursor.fetchone()[0]
+        except DatabaseError:
+            # An unreachable replica is as good as infinitely behind
+            return float("inf")
+        # Null until the standby has replayed anything
+        return float(lag) if lag is not None else float("inf")
+
+
+lag_monitor = _LagMonitor()
+
+
+class _ReadRouting:
+    def __init__(self, view):
+        self.view = view
+        self._alias = None
+
+    @property
+    def alias(self):
+        # Decided on the first routed read, once the view has authenticated
+        # the request
+        if self._alias is None:
+            user = getattr(getattr(self.view, "request", None), "user", None)
+            sticky = user is not None and user.is_authenticated and cache.get(_sticky_key(user.pk))
+            lagging = lag_monitor.lag() > settings.REPLICA_MAX_LAG_SECONDS
+            self._alias = DEFAULT_DB_ALIAS if sticky or lagging else REPLICA_DB_ALIAS
+        return self._alias
+
+
+@contextmanager
+def replica_reads(view):
+    """
+    Routes reads of REPLICA_APPS models to the replica for the duration,
+    unless the user `view` is serving is sticky or the replica is lagging.
+    """
+    if not replica_configured():
+        yield
+        return
+
+    token = _read_routing.set(_ReadRouting(view))
+    try:
+        yield
+    finally:
+        _read_routing.reset(token)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _read_routing.get()
+        if routing is None or model._meta.app_label not in REPLICA_APPS:
+            return None
+        return routing.alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,102 @@
+import time
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from dggcrm.tickets.models import Ticket
+
+from .routers import REPLICA_DB_ALIAS, lag_monitor
+
+User = get_user_model()
+
+REPLICA_CONFIGURED = REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@skipUnless(REPLICA_CONFIGURED, "REPLICA_DATABASE_URL is not set")
+class ReadReplicaRoutingTests(TestCase):
+    """
+    The replica mirrors the test database over its own connection, outside
+    the test's transaction, so it cannot see rows the test creates: like a
+    replica that has not caught up yet.
+    """
+    # Checked by the test runner even when the tests are skipped
+    databases = {"default", REPLICA_DB_ALIAS} if REPLICA_CONFIGURED else {"default"}
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        # Only the primary's pool is closed before the test database is
+        # dropped
+        connections[REPLICA_DB_ALIAS].close_pool()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="organizer", password="unused", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.ticket = Ticket.objects.create(title="Only on the primary")
+
+    def record_ticket_queries(self, alias):
+        """
+        Records, for every query on `alias` touching tickets, whether it
+        ran in a transaction opened by the request.
+        """
+        connection = connections[alias]
+        # The test's own transaction, on the primary only
+        baseline = len(connection.atomic_blocks)
+        queries = []
+
+        def wrapper(execute, sql, params, many, context):
+            if '"tickets"' in sql:
+                queries.append(len(connection.atomic_blocks) > baseline)
+            return execute(sql, params, many, context)
+
+        return connection.execute_wrapper(wrapper), queries
+
+    def list_ticket_ids(self):
+        response = self.client.get("/api/tickets/")
+        self.assertEqual(response.status_code, 200)
+        return [ticket["id"] for ticket in response.json()["results"]]
+
+    def create_ticket(self):
+        response = self.client.post("/api/tickets/", {"title": "Follow up"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        return response.json()["id"]
+
+    def test_safe_reads_use_the_replica_in_autocommit(self):
+        replica_wrapper, replica_queries = self.record_ticket_queries(REPLICA_DB_ALIAS)
+        primary_wrapper, primary_queries = self.record_ticket_queries("default")
+        with replica_wrapper, primary_wrapper:
+            self.assertNotIn(self.ticket.id, self.list_ticket_ids())
+
+        self.assertTrue(replica_queries)
+        self.assertFalse(any(replica_queries))
+        self.assertEqual(primary_queries, [])
+
+    def test_writes_are_atomic_on_the_primary(self):
+        replica_wrapper, replica_queries = self.record_ticket_queries(REPLICA_DB_ALIAS)
+        primary_wrapper, primary_queries = self.record_ticket_queries("default")
+        with replica_wrapper, primary_wrapper:
+            self.create_ticket()
+
+        self.assertTrue(primary_queries)
+        self.assertTrue(all(primary_queries))
+        self.assertEqual(replica_queries, [])
+
+    @override_settings(REPLICA_STICKY_SECONDS=0.5)
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        ticket_id = self.create_ticket()
+        self.assertIn(ticket_id, self.list_ticket_ids())
+
+        # Sticky for whole seconds, as the cache stores them
+        time.sleep(1.1)
+        self.assertNotIn(ticket_id, self.list_ticket_ids())
+
+    def test_lagging_replica_falls_back_to_the_primary(self):
+        with mock.patch.object(lag_monitor, "lag", return_value=settings.REPLICA_MAX_LAG_SECONDS + 1):
+            self.assertIn(self.ticket.id, self.list_ticket_ids())
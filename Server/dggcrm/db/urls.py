@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import PoolStatsView
+
+urlpatterns = [
+    path("internal/db/pool/", PoolStatsView.as_view(), name="db-pool-stats"),
+]
@@ -0,0 +1,17 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .mixins import TransactionPolicyMixin
+from .pool import pool_stats
+
+
+class PoolStatsView(TransactionPolicyMixin, APIView):
+    """
+    GET /api/internal/db/pool/
+    Connection pool usage of the worker process that serves the request.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(pool_stats())
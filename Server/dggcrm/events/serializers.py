@@ -2,6 +2,8 @@ from rest_framework import serializers
 
 from django.contrib.auth import get_user_model
 
+from dggcrm.accounts.scopes import ScopedRelatedFieldsMixin
+
 from .models import Event, EventParticipation, UsersInEvent
 
 User = get_user_model()
@@ -20,7 +22,7 @@ class EventSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'location_display', 'modified_at', 'status_display']
 
 
-class EventParticipationSerializer(serializers.ModelSerializer):
+class EventParticipationSerializer(ScopedRelatedFieldsMixin, serializers.ModelSerializer):
     status_display = serializers.CharField(
         source="get_status_display",
         read_only=True,
@@ -32,7 +34,7 @@ class EventParticipationSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "modified_at", "status_display"]
 
 
-class UsersInEventSerializer(serializers.ModelSerializer):
+class UsersInEventSerializer(ScopedRelatedFieldsMixin, serializers.ModelSerializer):
     user_username = serializers.CharField(
         source="user.username",
         read_only=True,
@@ -1,13 +1,19 @@
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Count, Q, F
 
+from dggcrm.accounts.scopes import IsOrganizerOrReadOnly, ScopedQuerysetMixin, access_scope
+from dggcrm.concurrency.mixins import ConditionalUpdateMixin
+from dggcrm.db.mixins import TransactionPolicyMixin
+from dggcrm.idempotency.mixins import IdempotentMixin
+
 from .models import Event, EventParticipation, UsersInEvent, CommitmentStatus
 from .serializers import EventSerializer, EventParticipationSerializer, UsersInEventSerializer
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(TransactionPolicyMixin, IdempotentMixin, ConditionalUpdateMixin, ScopedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all().order_by('-created_at')
     serializer_class = EventSerializer
     filter_backends = [filters.OrderingFilter, filters.SearchFilter]
@@ -34,7 +40,7 @@ class EventViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class EventParticipationViewSet(viewsets.ModelViewSet):
+class EventParticipationViewSet(TransactionPolicyMixin, IdempotentMixin, ScopedQuerysetMixin, viewsets.ModelViewSet):
     queryset = (
         EventParticipation.objects
         .select_related("event", "contact")
@@ -88,9 +94,9 @@ class EventParticipationViewSet(viewsets.ModelViewSet):
         max_events = request.query_params.get("max_events")
         status = request.query_params.get("status", CommitmentStatus.ATTENDED)
 
-        qs = EventParticipation.objects.filter(
+        qs = access_scope(request).filter(EventParticipation.objects.filter(
             status=status,
-        )
+        ))
 
         # Query date ranges
         if min_date:
@@ -122,12 +128,14 @@ class EventParticipationViewSet(viewsets.ModelViewSet):
         return Response(qs)
 
 
-class UsersInEventViewSet(viewsets.ModelViewSet):
+class UsersInEventViewSet(TransactionPolicyMixin, IdempotentMixin, ScopedQuerysetMixin, viewsets.ModelViewSet):
     queryset = UsersInEvent.objects.select_related(
         "user",
         "event",
     )
     serializer_class = UsersInEventSerializer
+    # Membership decides what volunteers can see, so only organizers change it
+    permission_classes = [IsAuthenticated, IsOrganizerOrReadOnly]
 
     filter_backends = [
         filters.SearchFilter,
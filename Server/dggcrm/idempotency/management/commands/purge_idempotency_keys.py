@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dggcrm.idempotency.models import IdempotentResponse
+
+
+class Command(BaseCommand):
+    help = "Delete stored Idempotency-Key responses past their TTL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            # Small batches keep each delete's locks short
+            keys = list(
+                IdempotentResponse.objects
+                .filter(expires_at__lte=now)
+                .values_list("key", flat=True)[:options["batch_size"]]
+            )
+            if not keys:
+                break
+            deleted += IdempotentResponse.objects.filter(key__in=keys).delete()[0]
+
+        self.stdout.write(f"Deleted {deleted} expired idempotency keys")
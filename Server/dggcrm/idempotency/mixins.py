@@ -0,0 +1,121 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import IdempotentResponse
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENT_METHODS = ("POST", "PATCH")
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for a different request."
+    default_code = "idempotency_key_reused"
+
+
+class _Replay(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _replay(stored):
+    response = HttpResponse(bytes(stored.body), status=stored.status_code, content_type=stored.content_type or None)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+class IdempotentMixin:
+    """
+    ViewSet mixin that makes POST and PATCH requests carrying an
+    Idempotency-Key header safe to retry: the first response is stored and
+    later requests with the same key get it back without running the view.
+
+    The key is held from the start of the request's transaction, so a
+    concurrent retry waits for the first request and then replays it, and
+    nothing is stored for requests that fail and roll back.
+    """
+
+    def initialize_request(self, request, *args, **kwargs):
+        if request.method in IDEMPOTENT_METHODS and IDEMPOTENCY_HEADER in request.headers:
+            # Read the raw body while it is still available: authentication
+            # parses it (SessionAuthentication's CSRF check reads POST), and
+            # it can't be read once the stream has been consumed
+            request.body
+        return super().initialize_request(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._idempotent_response = None
+
+        client_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if client_key is None or request.method not in IDEMPOTENT_METHODS:
+            return
+        if not client_key or len(client_key) > MAX_KEY_LENGTH:
+            raise ValidationError({IDEMPOTENCY_HEADER: f"Must be 1 to {MAX_KEY_LENGTH} characters"})
+
+        user = request.user
+        key = _sha256(user.pk if user.is_authenticated else "", client_key)
+        request_hash = _sha256(request.method, request.get_full_path(), request._request.body)
+        now = timezone.now()
+
+        stored = IdempotentResponse.objects.filter(key=key).first()
+        if stored is not None and stored.expires_at <= now:
+            # Not purged yet, see `manage.py purge_idempotency_keys`
+            stored.delete()
+            stored = None
+
+        if stored is None:
+            stored = IdempotentResponse(
+                key=key,
+                request_hash=request_hash,
+                body=b"",
+                expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+            )
+            try:
+                with transaction.atomic():
+                    stored.save(force_insert=True)
+                self._idempotent_response = stored
+                return
+            except IntegrityError:
+                # Another request with this key committed first
+                stored = IdempotentResponse.objects.get(key=key)
+
+        if stored.request_hash != request_hash:
+            raise IdempotencyKeyReused()
+        raise _Replay(_replay(stored))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _Replay):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        # Nothing is kept for failed requests: their transaction, and the
+        # key inserted in it, is rolled back
+        stored = getattr(self, "_idempotent_response", None)
+        connection = transaction.get_connection()
+        if stored is not None and not (connection.in_atomic_block and connection.needs_rollback):
+            response.render()
+            stored.status_code = response.status_code
+            stored.content_type = response.get("Content-Type", "")
+            stored.body = response.content
+            stored.save(update_fields=["status_code", "content_type", "body"])
+        return response
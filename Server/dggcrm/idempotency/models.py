@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class IdempotentResponse(models.Model):
+    """
+    Response to a write sent with an Idempotency-Key header, replayed when
+    the client retries with the same key instead of running the write again.
+    Rows expire after IDEMPOTENCY_KEY_TTL_HOURS.
+    """
+    # sha256 of the user and the client's key, so lookups hit the primary
+    # key and arbitrary client strings are never stored
+    key = models.CharField(max_length=64, primary_key=True)
+    # sha256 of the method, path and body the key was first used with
+    request_hash = models.CharField(max_length=64)
+
+    # Null while the first request with the key is still running
+    status_code = models.PositiveSmallIntegerField(null=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    body = models.BinaryField()
+
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "idempotent_responses"
+
+    def __str__(self):
+        return f"{self.key[:12]} ({self.status_code})"
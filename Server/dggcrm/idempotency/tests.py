@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.middleware.csrf import _get_new_csrf_string
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from dggcrm.contacts.models import Tag
+
+User = get_user_model()
+
+
+class IdempotentMixinTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="organizer", password="unused")
+        # Session authentication, with the CSRF check it runs on every POST
+        self.client = APIClient(enforce_csrf_checks=True)
+        self.client.force_login(self.user)
+        token = _get_new_csrf_string()
+        self.client.cookies["csrftoken"] = token
+        self.csrf = {"HTTP_X_CSRFTOKEN": token}
+
+    def post(self, data, key, format="multipart"):
+        return self.client.post("/api/tags/", data, format=format, HTTP_IDEMPOTENCY_KEY=key, **self.csrf)
+
+    def test_multipart_retry_is_replayed(self):
+        first = self.post({"name": "canvass"}, "tag-1")
+        self.assertEqual(first.status_code, 201)
+
+        retry = self.post({"name": "canvass"}, "tag-1")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(Tag.objects.filter(name="canvass").count(), 1)
+
+    def test_key_reused_for_different_body(self):
+        self.assertEqual(self.post({"name": "phonebank"}, "tag-2", format="json").status_code, 201)
+
+        response = self.post({"name": "textbank"}, "tag-2", format="json")
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(Tag.objects.filter(name="textbank").exists())
@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class MetricsConfig(AppConfig):
+    name = "dggcrm.metrics"
+    verbose_name = "CRM.metrics"
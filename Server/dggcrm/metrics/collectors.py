@@ -0,0 +1,104 @@
+"""
+Request metrics in the Prometheus text format, labelled by view (the
+ViewSet or view class) and action (the ViewSet action, or the HTTP method
+for other views), and metrics of the calls made to OAuth providers,
+labelled by host.
+
+With PROMETHEUS_MULTIPROC_DIR set, every worker process writes its values
+to memory-mapped files in that directory and a scrape of any worker adds
+them all up. Without it (e.g. runserver) the metrics are this process's.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LABELS = ["view", "action"]
+
+REQUESTS = Counter(
+    "dggcrm_http_requests",
+    "Requests served.",
+    [*LABELS, "method", "status"],
+)
+LATENCY = Histogram(
+    "dggcrm_http_request_duration_seconds",
+    "Time to serve a request, from the first middleware to the last.",
+    LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+QUERIES = Histogram(
+    "dggcrm_http_request_db_queries",
+    "Database queries made while serving a request.",
+    LABELS,
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+RESPONSE_SIZE = Histogram(
+    "dggcrm_http_response_size_bytes",
+    "Size of response bodies; streamed responses are left out.",
+    LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+PROVIDER_REQUESTS = Counter(
+    "dggcrm_provider_requests",
+    "Calls to OAuth providers; status is \"error\" when no response came back.",
+    ["host", "method", "status"],
+)
+PROVIDER_LATENCY = Histogram(
+    "dggcrm_provider_request_duration_seconds",
+    "Time an OAuth provider call took, retries included.",
+    ["host"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+def view_labels(request):
+    """
+    The (view, action) labels of the view that served `request`.
+    """
+    match = request.resolver_match
+    if match is None:
+        return "unmatched", ""
+
+    func = match.func
+    view_class = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    method = request.method.lower()
+    if view_class is None:
+        return f"{func.__module__}.{func.__name__}", method
+
+    # ViewSet routes map each HTTP method to an action
+    actions = getattr(func, "actions", None) or {}
+    return view_class.__name__, actions.get(method, method)
+
+
+def observe(request, response, seconds, queries):
+    labels = view_labels(request)
+    REQUESTS.labels(*labels, request.method, response.status_code).inc()
+    LATENCY.labels(*labels).observe(seconds)
+    QUERIES.labels(*labels).observe(queries)
+    if not response.streaming:
+        RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+
+
+def observe_provider(host, method, status, seconds):
+    PROVIDER_REQUESTS.labels(host, method, status).inc()
+    PROVIDER_LATENCY.labels(host).observe(seconds)
+
+
+def exposition():
+    """
+    The current metrics of all worker processes, with their content type.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
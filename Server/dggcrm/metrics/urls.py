@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import MetricsView
+
+urlpatterns = [
+    path("internal/metrics/", MetricsView.as_view(), name="metrics"),
+]
@@ -0,0 +1,37 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.views import APIView
+
+from dggcrm.db.mixins import TransactionPolicyMixin
+
+from .collectors import exposition
+
+
+class HasMetricsToken(BasePermission):
+    """
+    The request carries "Authorization: Bearer <METRICS_TOKEN>".
+    """
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        header = request.headers.get("Authorization", "")
+        return bool(token) and hmac.compare_digest(header.encode(), f"Bearer {token}".encode())
+
+
+class MetricsView(TransactionPolicyMixin, APIView):
+    """
+    GET /api/internal/metrics/
+    Request metrics of all workers in the Prometheus text format, for the
+    scraper (METRICS_TOKEN) or signed-in staff.
+    """
+    # The scrape token is not a JWT, so it must not reach the token backend
+    authentication_classes = [SessionAuthentication]
+    permission_classes = [HasMetricsToken | IsAdminUser]
+
+    def get(self, request):
+        body, content_type = exposition()
+        return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['id', 'recipient', 'event', 'ticket', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'event', 'created_at']
+    search_fields = ['recipient__username', 'ticket__id']
+    ordering = ['-created_at']
+
+    readonly_fields = ['created_at', 'sent_at', 'last_error']
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dggcrm.notifications.worker import process_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver queued ticket notifications as per-recipient digests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and check for due notifications every --interval seconds",
+        )
+        parser.add_argument("--interval", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            claimed, sent = process_pending(batch_size=options["batch_size"])
+            if claimed:
+                self.stdout.write(f"Sent {sent} of {claimed} notifications")
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,71 @@
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class NotificationEvent(models.TextChoices):
+    ASSIGNED = "ASSIGNED", "Ticket assigned"
+    COMMENTED = "COMMENTED", "New comment"
+    UNBLOCKED = "UNBLOCKED", "Ticket unblocked"
+
+
+class NotificationStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    SENT = "SENT", "Sent"
+    FAILED = "FAILED", "Failed"
+
+
+class Notification(models.Model):
+    """
+    Outbox row for one user about one ticket change.
+    Written in the same transaction as the change and delivered later by
+    `manage.py send_notifications`, which sends each recipient a digest
+    of everything pending for them.
+    """
+    id = models.BigAutoField(primary_key=True)
+
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+    )
+    event = models.CharField(choices=NotificationEvent.choices)
+    ticket = models.ForeignKey(
+        "tickets.Ticket",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    message = models.TextField(blank=True)
+
+    status = models.CharField(
+        choices=NotificationStatus.choices,
+        default=NotificationStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Pending rows are delivered once this has passed; also pushed ahead
+    # while a worker holds them so a crashed worker's rows are retried
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "notifications"
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="PENDING"),
+                name="notifications_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_event_display()} on {self.ticket_id} for {self.recipient_id}"
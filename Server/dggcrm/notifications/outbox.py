@@ -0,0 +1,49 @@
+from collections import defaultdict
+
+from .models import Notification
+
+
+def notify_watchers(tickets, event, actor=None, message=""):
+    """
+    Queues `event` for everyone watching each of `tickets`: the assignee,
+    the reporter and anyone who has commented. The actor is not notified
+    of their own change.
+
+    Only writes outbox rows, in the caller's transaction, so nothing is
+    queued for a change that rolls back. Returns the queued rows.
+    """
+    # Imported here since the tickets app imports this module
+    from dggcrm.tickets.models import TicketComment
+
+    tickets = list(tickets)
+    if not tickets:
+        return []
+
+    watchers = defaultdict(set)
+    for ticket in tickets:
+        watchers[ticket.pk].update(
+            user_id for user_id in (ticket.assigned_to_id, ticket.reported_by_id) if user_id
+        )
+
+    commenters = (
+        TicketComment.objects
+        .filter(ticket__in=list(watchers), author__isnull=False)
+        .values_list("ticket_id", "author_id")
+        .distinct()
+    )
+    for ticket_id, author_id in commenters:
+        watchers[ticket_id].add(author_id)
+
+    actor_id = actor.pk if actor is not None else None
+    return Notification.objects.bulk_create([
+        Notification(
+            recipient_id=user_id,
+            event=event,
+            ticket_id=ticket_id,
+            actor_id=actor_id,
+            message=message,
+        )
+        for ticket_id, user_ids in watchers.items()
+        for user_id in sorted(user_ids)
+        if user_id != actor_id
+    ])
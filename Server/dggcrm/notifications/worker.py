@@ -0,0 +1,179 @@
+"""
+Delivery of queued ticket notifications.
+
+Workers claim due outbox rows with SKIP LOCKED and lease them by pushing
+next_attempt_at ahead, so the claim transaction stays short and delivery
+happens outside of it. Everything claimed for the same recipient is sent
+as one digest. Failed digests are retried with exponential backoff until
+NOTIFICATIONS_MAX_ATTEMPTS.
+"""
+import random
+from collections import defaultdict
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification, NotificationStatus
+
+
+class UndeliverableError(Exception):
+    """
+    Delivery can never succeed, so retrying is pointless.
+    """
+
+
+def claim_batch(batch_size=None):
+    """
+    Claims up to `batch_size` due notifications for this worker.
+    """
+    batch_size = batch_size or settings.NOTIFICATIONS_BATCH_SIZE
+    now = timezone.now()
+
+    with transaction.atomic():
+        ids = list(
+            Notification.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=NotificationStatus.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+
+        Notification.objects.filter(id__in=ids).update(
+            attempts=F("attempts") + 1,
+            next_attempt_at=now + timedelta(seconds=settings.NOTIFICATIONS_LEASE_SECONDS),
+        )
+
+    return list(
+        Notification.objects
+        .filter(id__in=ids)
+        .select_related("recipient", "ticket", "actor")
+        .order_by("id")
+    )
+
+
+def retry_delay(attempts):
+    """
+    Seconds to wait before the next attempt after `attempts` failures.
+    """
+    delay = min(
+        settings.NOTIFICATIONS_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.NOTIFICATIONS_RETRY_MAX_SECONDS,
+    )
+    # Jitter so digests that failed together are not retried together
+    return delay * random.uniform(0.8, 1.2)
+
+
+def render_digest(notifications):
+    """
+    Subject and plain text body for a recipient's pending notifications.
+    """
+    if len(notifications) == 1:
+        notification = notifications[0]
+        subject = f"[Ticket {notification.ticket_id}] {notification.get_event_display()}"
+    else:
+        subject = f"{len(notifications)} ticket updates"
+
+    lines = []
+    for notification in notifications:
+        ticket = notification.ticket
+        actor = notification.actor.username if notification.actor else "someone"
+        lines.append(f"#{ticket.id} {ticket.title}: {notification.get_event_display()} by {actor}")
+        if notification.message:
+            lines.extend(f"    {line}" for line in notification.message.splitlines())
+
+    return subject, "\n".join(lines) + "\n"
+
+
+def send_digest(recipient, notifications):
+    subject, body = render_digest(notifications)
+
+    if settings.NOTIFICATIONS_CHANNEL == "webhook":
+        response = requests.post(
+            settings.NOTIFICATIONS_WEBHOOK_URL,
+            json={
+                "recipient": {"id": recipient.pk, "username": recipient.username, "email": recipient.email},
+                "subject": subject,
+                "body": body,
+                "notifications": [
+                    {
+                        "id": notification.id,
+                        "event": notification.event,
+                        "ticket": notification.ticket_id,
+                        "actor": notification.actor_id,
+                        "message": notification.message,
+                        "created_at": notification.created_at.isoformat(),
+                    }
+                    for notification in notifications
+                ],
+            },
+            timeout=settings.NOTIFICATIONS_WEBHOOK_TIMEOUT,
+        )
+        response.raise_for_status()
+        return
+
+    if not recipient.email:
+        raise UndeliverableError("Recipient has no email address")
+    send_mail(subject, body, None, [recipient.email])
+
+
+def deliver(notifications):
+    """
+    Sends one digest per recipient and records the outcome of each.
+    Returns the number of notifications sent.
+    """
+    by_recipient = defaultdict(list)
+    for notification in notifications:
+        by_recipient[notification.recipient_id].append(notification)
+
+    sent = 0
+    for digest in by_recipient.values():
+        ids = [notification.id for notification in digest]
+        try:
+            send_digest(digest[0].recipient, digest)
+        except Exception as e:
+            attempts = max(notification.attempts for notification in digest)
+            if isinstance(e, UndeliverableError) or attempts >= settings.NOTIFICATIONS_MAX_ATTEMPTS:
+                Notification.objects.filter(id__in=ids).update(
+                    status=NotificationStatus.FAILED,
+                    last_error=str(e),
+                )
+            else:
+                Notification.objects.filter(id__in=ids).update(
+                    next_attempt_at=timezone.now() + timedelta(seconds=retry_delay(attempts)),
+                    last_error=str(e),
+                )
+            continue
+
+        Notification.objects.filter(id__in=ids).update(
+            status=NotificationStatus.SENT,
+            sent_at=timezone.now(),
+            last_error="",
+        )
+        sent += len(digest)
+
+    return sent
+
+
+def process_pending(batch_size=None, max_batches=None):
+    """
+    Delivers due notifications until none are left (or `max_batches`).
+    Returns the number claimed and the number sent.
+    """
+    claimed = sent = batches = 0
+    while max_batches is None or batches < max_batches:
+        notifications = claim_batch(batch_size)
+        if not notifications:
+            break
+
+        claimed += len(notifications)
+        sent += deliver(notifications)
+        batches += 1
+
+    return claimed, sent
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ProfilingConfig(AppConfig):
+    name = "dggcrm.profiling"
+    verbose_name = "CRM.profiling"
+
+    def ready(self):
+        from . import timings
+
+        timings.install_serializer_hooks()
@@ -0,0 +1,86 @@
+"""
+Where the time of a sampled request goes: database queries, serializers
+and rendering. ServerTimingMiddleware starts the measurement; the hooks
+here add to it without the views knowing.
+"""
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework.serializers import BaseSerializer
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.seconds = {"db": 0.0, "serialize": 0.0, "render": 0.0}
+        self._depth = dict.fromkeys(self.seconds, 0)
+
+    @contextmanager
+    def measure(self, name):
+        # Only the outermost of nested measurements counts, e.g. a serializer
+        # whose method field reads another serializer's data
+        self._depth[name] += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth[name] -= 1
+            if not self._depth[name]:
+                self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        self.seconds[name] += seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper() hook
+        self.queries += 1
+        with self.measure("db"):
+            return execute(sql, params, many, context)
+
+
+@contextmanager
+def collect():
+    """
+    Measures the code in the block, yielding its RequestTimings.
+    """
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current():
+    """
+    The RequestTimings being collected, or None if the request is not sampled.
+    """
+    return _current.get()
+
+
+def _timed(func, name):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return func(*args, **kwargs)
+        with timings.measure(name):
+            return func(*args, **kwargs)
+
+    wrapper.timed = True
+    return wrapper
+
+
+def install_serializer_hooks():
+    """
+    Times every serializer's validation and representation. Serializer and
+    ListSerializer both build their data in BaseSerializer.data.
+    """
+    if getattr(BaseSerializer.is_valid, "timed", False):
+        return
+    BaseSerializer.is_valid = _timed(BaseSerializer.is_valid, "serialize")
+    BaseSerializer.data = property(_timed(BaseSerializer.data.fget, "serialize"))
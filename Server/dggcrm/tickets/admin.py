@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Ticket, TicketComment
+from .models import Ticket, TicketComment, TicketTemplate, TicketTemplateItem
 
 
 @admin.register(Ticket)
@@ -31,3 +31,23 @@ class TicketCommentAdmin(admin.ModelAdmin):
         if not change and obj.author is None:
             obj.author = request.user
         super().save_model(request, obj, form, change)
+
+
+class TicketTemplateItemInline(admin.TabularInline):
+    model = TicketTemplateItem
+    extra = 1
+
+
+@admin.register(TicketTemplate)
+class TicketTemplateAdmin(admin.ModelAdmin):
+    list_display = ['name', 'created_by', 'created_at', 'modified_at']
+    search_fields = ['name']
+    ordering = ['name']
+    inlines = [TicketTemplateItemInline]
+
+    readonly_fields = ['created_by', 'created_at', 'modified_at']
+
+    def save_model(self, request, obj, form, change):
+        if not change and obj.created_by is None:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
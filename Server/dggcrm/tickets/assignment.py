@@ -0,0 +1,130 @@
+import heapq
+from itertools import cycle
+
+from auditlog import get_logentry_model
+from auditlog.diff import model_instance_diff
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, When
+from django.utils import timezone
+
+from dggcrm.audit.buffer import bulk_log
+
+from .models import Ticket, OPEN_TICKET_STATUSES
+
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+STRATEGIES = [ROUND_ROBIN, LEAST_LOADED]
+
+
+def open_ticket_counts(user_ids):
+    """
+    Open tickets currently assigned to each of `user_ids`, in one query.
+    """
+    counts = dict.fromkeys(user_ids, 0)
+    rows = (
+        Ticket.objects
+        .filter(assigned_to__in=user_ids, ticket_status__in=OPEN_TICKET_STATUSES)
+        .values("assigned_to")
+        .annotate(open_tickets=Count("id"))
+        .values_list("assigned_to", "open_tickets")
+    )
+    counts.update(rows)
+    return counts
+
+
+def plan_assignments(ticket_ids, load, strategy):
+    """
+    Maps each of `ticket_ids` to a user in `load` ({user_id: open tickets}).
+
+    round_robin deals tickets out in turn, starting with the least loaded
+    users; least_loaded gives every ticket to whoever has the fewest open
+    tickets at that point, evening out existing imbalance first.
+    """
+    by_load = sorted(load, key=lambda user_id: (load[user_id], user_id))
+
+    if strategy == ROUND_ROBIN:
+        return dict(zip(ticket_ids, cycle(by_load)))
+
+    heap = [(load[user_id], user_id) for user_id in by_load]
+    heapq.heapify(heap)
+    plan = {}
+    for ticket_id in ticket_ids:
+        count, user_id = heapq.heappop(heap)
+        plan[ticket_id] = user_id
+        heapq.heappush(heap, (count + 1, user_id))
+    return plan
+
+
+def balance_tickets(queryset, user_ids, strategy=LEAST_LOADED, limit=None, audit_context=None):
+    """
+    Assigns the unassigned open tickets in `queryset` across `user_ids`,
+    highest priority first, with a single UPDATE.
+
+    Tickets locked by a concurrent claim are skipped. Returns the assigned
+    tickets (not re-read from the DB) and the per-user distribution:
+    ``{user_id: {"open_before", "assigned", "open_after"}}``.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+
+    with transaction.atomic():
+        rows = list(
+            queryset
+            .filter(assigned_to__isnull=True, ticket_status__in=OPEN_TICKET_STATUSES)
+            .select_for_update(skip_locked=True)
+            .order_by("priority", "created_at", "id")
+            .values_list("id", "ticket_status", "reported_by_id")[:limit]
+        )
+        load = open_ticket_counts(user_ids)
+        plan = plan_assignments([row[0] for row in rows], load, strategy)
+
+        distribution = {
+            user_id: {"open_before": load[user_id], "assigned": 0, "open_after": load[user_id]}
+            for user_id in user_ids
+        }
+        tickets_by_user = {}
+        for ticket_id, user_id in plan.items():
+            tickets_by_user.setdefault(user_id, []).append(ticket_id)
+            distribution[user_id]["assigned"] += 1
+            distribution[user_id]["open_after"] += 1
+
+        if not plan:
+            return [], distribution
+
+        now = timezone.now()
+        Ticket.objects.filter(id__in=list(plan)).update(
+            assigned_to=Case(
+                *[When(id__in=ids, then=user_id) for user_id, ids in tickets_by_user.items()],
+            ),
+            modified_at=now,
+        )
+
+        tickets = [
+            Ticket(
+                id=ticket_id,
+                ticket_status=ticket_status,
+                assigned_to_id=plan[ticket_id],
+                reported_by_id=reported_by_id,
+                modified_at=now,
+            )
+            for ticket_id, ticket_status, reported_by_id in rows
+        ]
+
+        # One diff per assignee, shared by all of their tickets
+        diffs = {
+            user_id: model_instance_diff(
+                Ticket(assigned_to_id=None),
+                Ticket(assigned_to_id=user_id),
+                fields_to_check=["assigned_to"],
+                use_json_for_changes=settings.AUDITLOG_STORE_JSON_CHANGES,
+            )
+            for user_id in tickets_by_user
+        }
+        bulk_log(
+            Ticket,
+            [(ticket.pk, str(ticket), diffs[ticket.assigned_to_id]) for ticket in tickets],
+            get_logentry_model().Action.UPDATE,
+            **(audit_context or {}),
+        )
+
+    return tickets, distribution
@@ -0,0 +1,102 @@
+import base64
+import binascii
+import json
+
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q, Window
+from django.db.models.functions import Greatest, RowNumber
+from django.utils.dateparse import parse_datetime
+
+from .models import TicketStatus
+
+# Order of tickets within a board column; id breaks ties for cursors
+BOARD_ORDERING = ("priority", "created_at", "id")
+
+
+def encode_cursor(ticket):
+    position = [ticket.priority, ticket.created_at.isoformat(), ticket.id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Returns the (priority, created_at, id) position a column cursor points
+    at. Raises ValueError if the cursor is malformed.
+    """
+    try:
+        priority, created_at, ticket_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    created_at = parse_datetime(created_at) if isinstance(created_at, str) else None
+    if created_at is None or not isinstance(priority, int) or not isinstance(ticket_id, int):
+        raise ValueError("Invalid cursor")
+    return priority, created_at, ticket_id
+
+
+def _after(position):
+    priority, created_at, ticket_id = position
+    return (
+        Q(priority__gt=priority)
+        | Q(priority=priority, created_at__gt=created_at)
+        | Q(priority=priority, created_at=created_at, id__gt=ticket_id)
+    )
+
+
+def board_columns(queryset, limit, cursors=None, statuses=TicketStatus.values):
+    """
+    The first `limit` tickets of every status column in `queryset`, with
+    each column's total, fetched in a single query.
+
+    `cursors` maps a status to a position from decode_cursor(); that column
+    then continues after it while the others start from the top.
+    Returns a dict of each of `statuses` to
+    ``{"total", "tickets", "has_more"}``.
+    """
+    cursors = cursors or {}
+    order = [F(field).asc() for field in BOARD_ORDERING]
+
+    annotations = {
+        "board_total": Window(Count("id"), partition_by=[F("ticket_status")]),
+    }
+    if cursors:
+        # Rows past their column's cursor sort first, so numbering them
+        # before the rest and keeping rows up to their count pages each
+        # column independently while totals still cover the whole column
+        remaining = ~Q(ticket_status__in=list(cursors))
+        for status, position in cursors.items():
+            remaining |= Q(ticket_status=status) & _after(position)
+
+        annotations["board_remaining"] = Window(
+            Count("id", filter=remaining),
+            partition_by=[F("ticket_status")],
+        )
+        order.insert(0, ExpressionWrapper(remaining, output_field=BooleanField()).desc())
+
+    annotations["board_row"] = Window(RowNumber(), partition_by=[F("ticket_status")], order_by=order)
+
+    qs = (
+        queryset
+        .filter(ticket_status__in=list(statuses))
+        .order_by()
+        .annotate(**annotations)
+        .filter(board_row__lte=limit)
+    )
+    if cursors:
+        # One row is kept for exhausted columns so their total is known
+        qs = qs.filter(board_row__lte=Greatest(F("board_remaining"), 1))
+
+    columns = {
+        status: {"total": 0, "tickets": [], "has_more": False}
+        for status in statuses
+    }
+    for ticket in qs.order_by("ticket_status", "board_row"):
+        column = columns[ticket.ticket_status]
+        column["total"] = ticket.board_total
+
+        remaining = ticket.board_remaining if cursors else ticket.board_total
+        if ticket.board_row > remaining:
+            continue
+        column["tickets"].append(ticket)
+        column["has_more"] = remaining > len(column["tickets"])
+
+    return columns
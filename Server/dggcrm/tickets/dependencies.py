@@ -0,0 +1,139 @@
+from auditlog import get_logentry_model
+from auditlog.diff import model_instance_diff
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from dggcrm.audit.buffer import bulk_log
+
+from .models import Ticket, TicketDependency, TicketStatus
+
+# Blockers in these statuses no longer hold up their dependents
+RESOLVED_TICKET_STATUSES = [TicketStatus.COMPLETED, TicketStatus.CANCELED]
+
+
+class DependencyCycleError(ValueError):
+    """
+    Adding the dependency would make a ticket (transitively) block itself.
+    """
+
+
+def _dependents_sql():
+    # UNION (not UNION ALL) drops revisited tickets, so the walk ends even
+    # if a cycle ever made it into the table
+    table = connection.ops.quote_name(TicketDependency._meta.db_table)
+    return f"""
+        WITH RECURSIVE dependents(id) AS (
+            SELECT ticket_id FROM {table} WHERE blocked_by_id = %s
+            UNION
+            SELECT d.ticket_id
+            FROM {table} d
+            JOIN dependents ON d.blocked_by_id = dependents.id
+        )
+        SELECT id FROM dependents
+    """
+
+
+def transitively_blocked(ticket):
+    """
+    Tickets blocked by `ticket`, directly or through other tickets,
+    resolved by the database in one recursive query.
+    """
+    return Ticket.objects.filter(id__in=RawSQL(_dependents_sql(), [ticket.pk]))
+
+
+def add_dependency(ticket, blocked_by, created_by=None):
+    """
+    Records that `ticket` is blocked by `blocked_by`, returning the
+    dependency and whether it is new. Raises DependencyCycleError if
+    `blocked_by` already depends on `ticket`.
+    """
+    if ticket.pk == blocked_by.pk:
+        raise DependencyCycleError("A ticket cannot block itself")
+
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Two concurrent links can close a cycle neither check sees,
+            # so writers take turns; readers are not blocked
+            with connection.cursor() as cursor:
+                table = connection.ops.quote_name(TicketDependency._meta.db_table)
+                cursor.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+
+        if transitively_blocked(ticket).filter(pk=blocked_by.pk).exists():
+            raise DependencyCycleError(f"Ticket {blocked_by.pk} is already blocked by ticket {ticket.pk}")
+
+        return TicketDependency.objects.get_or_create(
+            ticket=ticket,
+            blocked_by=blocked_by,
+            defaults={"created_by": created_by},
+        )
+
+
+def release_dependents(ticket, new_status=TicketStatus.TODO, audit_context=None):
+    """
+    Moves BLOCKED tickets that depend on `ticket` to `new_status` in a
+    single UPDATE, once none of their blockers is still unresolved.
+    Returns the released tickets (not re-read from the DB).
+    """
+    qn = connection.ops.quote_name
+    tickets_table = qn(Ticket._meta.db_table)
+    dependencies_table = qn(TicketDependency._meta.db_table)
+    lock = " FOR UPDATE OF t" if connection.features.has_select_for_update_of else ""
+    resolved = ", ".join(["%s"] * len(RESOLVED_TICKET_STATUSES))
+    now = timezone.now()
+
+    sql = f"""
+        UPDATE {tickets_table}
+        SET ticket_status = %s, modified_at = %s
+        WHERE id IN (
+            SELECT t.id
+            FROM {tickets_table} t
+            JOIN {dependencies_table} d ON d.ticket_id = t.id
+            WHERE d.blocked_by_id = %s
+              AND t.ticket_status = %s
+              AND NOT EXISTS (
+                SELECT 1
+                FROM {dependencies_table} other
+                JOIN {tickets_table} blocker ON blocker.id = other.blocked_by_id
+                WHERE other.ticket_id = t.id
+                  AND blocker.ticket_status NOT IN ({resolved})
+              ){lock}
+        )
+        RETURNING id, assigned_to_id, reported_by_id
+    """
+    params = [
+        new_status,
+        connection.ops.adapt_datetimefield_value(now),
+        ticket.pk,
+        TicketStatus.BLOCKED,
+        *RESOLVED_TICKET_STATUSES,
+    ]
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        released = [
+            Ticket(
+                id=ticket_id,
+                ticket_status=new_status,
+                modified_at=now,
+                assigned_to_id=assigned_to_id,
+                reported_by_id=reported_by_id,
+            )
+            for ticket_id, assigned_to_id, reported_by_id in rows
+        ]
+
+        # Every released ticket made the same change
+        changes = model_instance_diff(
+            Ticket(ticket_status=TicketStatus.BLOCKED),
+            Ticket(ticket_status=new_status),
+            fields_to_check=["ticket_status"],
+            use_json_for_changes=settings.AUDITLOG_STORE_JSON_CHANGES,
+        )
+        entries = [(ticket.pk, str(ticket), changes) for ticket in released]
+        bulk_log(Ticket, entries, get_logentry_model().Action.UPDATE, **(audit_context or {}))
+
+    return released
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+
+from .models import Ticket, OPEN_TICKET_STATUSES
+
+# Most candidates returned for a single ticket
+MAX_SIMILAR_TICKETS = 5
+
+
+def similar_tickets(title, contact=None, event=None, ticket_type=None, exclude=None, queryset=None):
+    """
+    Open tickets for the same contact and/or event (and type, if given)
+    whose title is similar to `title`, most similar first, annotated with
+    their `similarity`. Only tickets in `queryset` (all by default) are
+    considered.
+
+    The `%` operator lets the trigram index on title narrow the match
+    before similarity is computed for the few rows left.
+    """
+    if not title or (contact is None and event is None):
+        return Ticket.objects.none()
+
+    if queryset is None:
+        queryset = Ticket.objects.all()
+    qs = queryset.filter(ticket_status__in=OPEN_TICKET_STATUSES, title__trigram_similar=title)
+    if contact is not None:
+        qs = qs.filter(contact=contact)
+    if event is not None:
+        qs = qs.filter(event=event)
+    if ticket_type:
+        qs = qs.filter(ticket_type=ticket_type)
+    if exclude is not None:
+        qs = qs.exclude(pk=exclude)
+
+    return (
+        qs.annotate(similarity=TrigramSimilarity("title", title))
+        .filter(similarity__gte=settings.TICKET_DUPLICATE_SIMILARITY)
+        .order_by("-similarity", "-created_at")[:MAX_SIMILAR_TICKETS]
+    )
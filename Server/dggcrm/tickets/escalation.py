@@ -0,0 +1,95 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from auditlog import get_logentry_model
+from auditlog.diff import model_instance_diff
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from dggcrm.audit.buffer import bulk_log
+
+from .models import Ticket
+
+
+def escalate_batch(statuses, older_than, max_priority, batch_size, now=None):
+    """
+    Raises the priority of up to `batch_size` tickets in `statuses` that
+    were last modified before `older_than` by one level, stopping at
+    `max_priority`. Oldest tickets go first.
+
+    One UPDATE in its own short transaction. Tickets locked by someone
+    else (e.g. being claimed) are skipped and picked up on a later run.
+    Returns the number of tickets escalated.
+    """
+    now = now or timezone.now()
+    tickets_table = connection.ops.quote_name(Ticket._meta.db_table)
+    status_params = ", ".join(["%s"] * len(statuses))
+    lock = " FOR UPDATE SKIP LOCKED" if connection.features.has_select_for_update_skip_locked else ""
+
+    sql = f"""
+        UPDATE {tickets_table}
+        SET priority = priority - 1, modified_at = %s
+        WHERE id IN (
+            SELECT id
+            FROM {tickets_table}
+            WHERE ticket_status IN ({status_params})
+              AND priority > %s
+              AND modified_at < %s
+            ORDER BY modified_at
+            LIMIT %s{lock}
+        )
+        RETURNING id, priority, ticket_status
+    """
+    params = [
+        connection.ops.adapt_datetimefield_value(now),
+        *statuses,
+        max_priority,
+        connection.ops.adapt_datetimefield_value(older_than),
+        batch_size,
+    ]
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        # Tickets that moved between the same two priorities share a diff
+        diffs = defaultdict(lambda: None)
+        entries = []
+        for ticket_id, priority, ticket_status in rows:
+            if diffs[priority] is None:
+                diffs[priority] = model_instance_diff(
+                    Ticket(priority=priority + 1),
+                    Ticket(priority=priority),
+                    fields_to_check=["priority"],
+                    use_json_for_changes=settings.AUDITLOG_STORE_JSON_CHANGES,
+                )
+            ticket = Ticket(id=ticket_id, ticket_status=ticket_status)
+            entries.append((ticket_id, str(ticket), diffs[priority]))
+
+        bulk_log(Ticket, entries, get_logentry_model().Action.UPDATE)
+
+    return len(rows)
+
+
+def escalate_tickets(statuses=None, after_days=None, max_priority=None, batch_size=None):
+    """
+    Escalates every eligible ticket, one batch at a time.
+    Returns the number of tickets escalated.
+    """
+    statuses = statuses or settings.TICKET_ESCALATION_STATUSES
+    after_days = settings.TICKET_ESCALATION_AFTER_DAYS if after_days is None else after_days
+    max_priority = settings.TICKET_ESCALATION_MAX_PRIORITY if max_priority is None else max_priority
+    batch_size = batch_size or settings.TICKET_ESCALATION_BATCH_SIZE
+
+    # Fixed for the whole run so escalated tickets are not picked up again
+    now = timezone.now()
+    older_than = now - timedelta(days=after_days)
+
+    escalated = 0
+    while True:
+        count = escalate_batch(statuses, older_than, max_priority, batch_size, now=now)
+        escalated += count
+        if count < batch_size:
+            return escalated
@@ -0,0 +1,36 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+# Must match the configuration used by the search_vector triggers
+TICKET_SEARCH_CONFIG = "english"
+
+
+class TicketFullTextFilter(filters.BaseFilterBackend):
+    """
+    Full-text search over ticket titles, descriptions and comments.
+    GET /tickets/?q=venue deposit
+
+    Accepts web search syntax ("quoted phrases", or, -excluded). Matches are
+    ranked best first unless an explicit ?ordering= is given, so this must
+    come after OrderingFilter in filter_backends.
+    """
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, "").strip()
+        if not terms:
+            return queryset
+
+        query = SearchQuery(terms, search_type="websearch", config=TICKET_SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query)
+
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+
+        return (
+            queryset
+            .annotate(search_rank=SearchRank(F("search_vector"), query))
+            .order_by("-search_rank", "-created_at")
+        )
@@ -0,0 +1,151 @@
+from auditlog import get_logentry_model
+from auditlog.diff import get_field_value, model_instance_diff
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.encoding import smart_str
+
+from dggcrm.audit.buffer import bulk_log
+from dggcrm.contacts.models import Tag, TagAssignments
+from dggcrm.events.models import Event, EventParticipation
+
+from .models import Ticket, TicketStatus, OPEN_TICKET_STATUSES
+
+
+def _creation_changes(tickets):
+    """
+    auditlog-style creation diffs for `tickets`. Generated tickets only
+    differ in id and contact, so the full diff is computed once and those
+    two fields are filled in per ticket.
+    """
+    if not tickets:
+        return []
+
+    use_json = settings.AUDITLOG_STORE_JSON_CHANGES
+    template = model_instance_diff(None, tickets[0], use_json_for_changes=use_json)
+    varying = [Ticket._meta.get_field("id"), Ticket._meta.get_field("contact")]
+
+    changes = []
+    for ticket in tickets:
+        diff = dict(template)
+        for field in varying:
+            value = get_field_value(ticket, field, use_json)
+            diff[field.name] = (template[field.name][0], value if use_json else smart_str(value))
+        changes.append(diff)
+    return changes
+
+
+def generate_tickets(
+    ticket_type,
+    event=None,
+    participation_status=None,
+    tag=None,
+    title="",
+    description="",
+    priority=Ticket.Priority.P3,
+    reported_by=None,
+    audit_context=None,
+):
+    """
+    Creates one ticket per contact in a segment with a single
+    INSERT ... SELECT. The segment is either the participants of `event`
+    with `participation_status`, or every contact tagged with `tag`.
+
+    Contacts that already have an open ticket of `ticket_type` for the same
+    event are skipped. Returns the created tickets (not re-read from the DB).
+    """
+    qn = connection.ops.quote_name
+    tickets_table = qn(Ticket._meta.db_table)
+    now = timezone.now()
+
+    if tag is not None:
+        source = f"{qn(TagAssignments._meta.db_table)} src"
+        where = "src.tag_id = %s"
+        source_params = [tag.pk]
+    else:
+        source = f"{qn(EventParticipation._meta.db_table)} src"
+        where = "src.event_id = %s AND src.status = %s"
+        source_params = [event.pk, participation_status]
+
+    if event is not None:
+        same_event = "t.event_id = %s"
+        same_event_params = [event.pk]
+    else:
+        same_event = "t.event_id IS NULL"
+        same_event_params = []
+
+    open_statuses = ", ".join(["%s"] * len(OPEN_TICKET_STATUSES))
+
+    sql = f"""
+        INSERT INTO {tickets_table} (
+            ticket_status, ticket_type, event_id, contact_id, reported_by_id,
+            title, description, priority, created_at, modified_at
+        )
+        SELECT %s, %s, %s, src.contact_id, %s, %s, %s, %s, %s, %s
+        FROM {source}
+        WHERE {where}
+          AND NOT EXISTS (
+            SELECT 1 FROM {tickets_table} t
+            WHERE t.contact_id = src.contact_id
+              AND t.ticket_type = %s
+              AND {same_event}
+              AND t.ticket_status IN ({open_statuses})
+          )
+        RETURNING id, contact_id
+    """
+    params = [
+        TicketStatus.OPEN,
+        ticket_type,
+        event.pk if event is not None else None,
+        reported_by.pk if reported_by is not None else None,
+        title,
+        description,
+        priority,
+        now,
+        now,
+        *source_params,
+        ticket_type,
+        *same_event_params,
+        *OPEN_TICKET_STATUSES,
+    ]
+
+    with transaction.atomic():
+        # Serialize generators for the same segment so two concurrent runs
+        # cannot both decide a contact has no open ticket yet
+        if event is not None:
+            Event.objects.select_for_update().filter(pk=event.pk).exists()
+        if tag is not None:
+            Tag.objects.select_for_update().filter(pk=tag.pk).exists()
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        tickets = [
+            Ticket(
+                id=ticket_id,
+                ticket_status=TicketStatus.OPEN,
+                ticket_type=ticket_type,
+                event=event,
+                contact_id=contact_id,
+                reported_by=reported_by,
+                title=title,
+                description=description,
+                priority=priority,
+                created_at=now,
+                modified_at=now,
+            )
+            for ticket_id, contact_id in rows
+        ]
+
+        bulk_log(
+            Ticket,
+            [
+                (ticket.pk, str(ticket), changes)
+                for ticket, changes in zip(tickets, _creation_changes(tickets))
+            ],
+            get_logentry_model().Action.CREATE,
+            **(audit_context or {}),
+        )
+
+    return tickets
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dggcrm.tickets.escalation import escalate_tickets
+from dggcrm.tickets.models import TicketStatus
+
+
+class Command(BaseCommand):
+    help = "Raise the priority of tickets that have gone untouched for too long."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--status",
+            action="append",
+            dest="statuses",
+            help="Status to escalate (repeatable, defaults to TICKET_ESCALATION_STATUSES)",
+        )
+        parser.add_argument("--after-days", type=int, default=None)
+        parser.add_argument("--max-priority", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and escalate every --interval seconds",
+        )
+        parser.add_argument("--interval", type=float, default=3600.0)
+
+    def handle(self, *args, **options):
+        unknown = set(options["statuses"] or []) - set(TicketStatus.values)
+        if unknown:
+            raise CommandError(f"Unknown status: {', '.join(sorted(unknown))}")
+
+        while True:
+            escalated = escalate_tickets(
+                statuses=options["statuses"],
+                after_days=options["after_days"],
+                max_priority=options["max_priority"],
+                batch_size=options["batch_size"],
+            )
+            self.stdout.write(f"Escalated {escalated} tickets")
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dggcrm.tickets.reports import rebuild_contact_ticket_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-contact ticket counts used by tickets/group_by_contact (PostgreSQL only)."
+
+    def handle(self, *args, **options):
+        buckets = rebuild_contact_ticket_counts()
+        self.stdout.write(f"Rebuilt {buckets} contact ticket count buckets")
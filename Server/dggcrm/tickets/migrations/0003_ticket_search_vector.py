@@ -0,0 +1,109 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:15
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# Weights: A = title, B = description, C = comment messages
+SEARCH_TRIGGERS_SQL = """
+CREATE FUNCTION ticket_search_vector(p_title text, p_description text, p_ticket_id integer)
+RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT setweight(to_tsvector('english', coalesce(p_title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(p_description, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(
+            (SELECT string_agg(message, ' ') FROM ticket_comments WHERE ticket_id = p_ticket_id),
+            ''
+        )), 'C')
+$$;
+
+CREATE FUNCTION tickets_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        NEW.search_vector := ticket_search_vector(NEW.title, NEW.description, NEW.id);
+    ELSIF NEW.title IS DISTINCT FROM OLD.title OR NEW.description IS DISTINCT FROM OLD.description THEN
+        NEW.search_vector := ticket_search_vector(NEW.title, NEW.description, NEW.id);
+    ELSE
+        -- ORM saves write back whatever vector they loaded, which may
+        -- predate a comment added since
+        NEW.search_vector := OLD.search_vector;
+    END IF;
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER tickets_search_vector
+BEFORE INSERT OR UPDATE OF title, description ON tickets
+FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_trigger();
+
+CREATE FUNCTION ticket_comments_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        -- New comments are appended to the ticket's existing vector
+        UPDATE tickets
+        SET search_vector = coalesce(search_vector, ''::tsvector)
+            || setweight(to_tsvector('english', NEW.message), 'C')
+        WHERE id = NEW.ticket_id;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Edited text cannot be subtracted from a tsvector, so rebuild it
+        UPDATE tickets
+        SET search_vector = ticket_search_vector(title, description, id)
+        WHERE id IN (OLD.ticket_id, NEW.ticket_id);
+    ELSE
+        UPDATE tickets
+        SET search_vector = ticket_search_vector(title, description, id)
+        WHERE id = OLD.ticket_id;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER ticket_comments_search_vector_insert
+AFTER INSERT ON ticket_comments
+FOR EACH ROW EXECUTE FUNCTION ticket_comments_search_vector_trigger();
+
+CREATE TRIGGER ticket_comments_search_vector_update
+AFTER UPDATE OF message, ticket_id ON ticket_comments
+FOR EACH ROW
+WHEN (OLD.message IS DISTINCT FROM NEW.message OR OLD.ticket_id IS DISTINCT FROM NEW.ticket_id)
+EXECUTE FUNCTION ticket_comments_search_vector_trigger();
+
+CREATE TRIGGER ticket_comments_search_vector_delete
+AFTER DELETE ON ticket_comments
+FOR EACH ROW EXECUTE FUNCTION ticket_comments_search_vector_trigger();
+
+UPDATE tickets SET search_vector = ticket_search_vector(title, description, id);
+"""
+
+DROP_SEARCH_TRIGGERS_SQL = """
+DROP TRIGGER ticket_comments_search_vector_delete ON ticket_comments;
+DROP TRIGGER ticket_comments_search_vector_update ON ticket_comments;
+DROP TRIGGER ticket_comments_search_vector_insert ON ticket_comments;
+DROP FUNCTION ticket_comments_search_vector_trigger();
+DROP TRIGGER tickets_search_vector ON tickets;
+DROP FUNCTION tickets_search_vector_trigger();
+DROP FUNCTION ticket_search_vector(text, text, integer);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0001_initial'),
+        ('events', '0001_initial'),
+        ('tickets', '0002_ticketcomment_delete_ticketauditlog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tickets_search__e16f7a_gin'),
+        ),
+        migrations.RunSQL(SEARCH_TRIGGERS_SQL, DROP_SEARCH_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Days are bucketed in TIME_ZONE, matching how group_by_contact reads them
+COUNT_KEY_SQL = f"contact_id, ticket_status, ticket_type, (created_at AT TIME ZONE '{settings.TIME_ZONE}')::date"
+
+# Statement-level triggers, so set-based writes update each bucket once
+COUNT_TRIGGERS_SQL = f"""
+CREATE FUNCTION ticket_contact_counts_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO ticket_contact_counts (contact_id, ticket_status, ticket_type, day, num_tickets)
+        SELECT {COUNT_KEY_SQL}, count(*)
+        FROM new_rows
+        WHERE contact_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ORDER BY 1, 2, 3, 4
+        ON CONFLICT (contact_id, ticket_status, ticket_type, day)
+        DO UPDATE SET num_tickets = ticket_contact_counts.num_tickets + EXCLUDED.num_tickets;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO ticket_contact_counts (contact_id, ticket_status, ticket_type, day, num_tickets)
+        SELECT {COUNT_KEY_SQL}, -count(*)
+        FROM old_rows
+        WHERE contact_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ORDER BY 1, 2, 3, 4
+        ON CONFLICT (contact_id, ticket_status, ticket_type, day)
+        DO UPDATE SET num_tickets = ticket_contact_counts.num_tickets + EXCLUDED.num_tickets;
+    ELSE
+        INSERT INTO ticket_contact_counts (contact_id, ticket_status, ticket_type, day, num_tickets)
+        SELECT {COUNT_KEY_SQL}, sum(delta)
+        FROM (
+            SELECT contact_id, ticket_status, ticket_type, created_at, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT contact_id, ticket_status, ticket_type, created_at, -1 AS delta FROM old_rows
+        ) changed
+        WHERE contact_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        HAVING sum(delta) <> 0
+        ORDER BY 1, 2, 3, 4
+        ON CONFLICT (contact_id, ticket_status, ticket_type, day)
+        DO UPDATE SET num_tickets = ticket_contact_counts.num_tickets + EXCLUDED.num_tickets;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER ticket_contact_counts_insert
+AFTER INSERT ON tickets REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION ticket_contact_counts_trigger();
+
+CREATE TRIGGER ticket_contact_counts_update
+AFTER UPDATE ON tickets REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION ticket_contact_counts_trigger();
+
+CREATE TRIGGER ticket_contact_counts_delete
+AFTER DELETE ON tickets REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION ticket_contact_counts_trigger();
+
+INSERT INTO ticket_contact_counts (contact_id, ticket_status, ticket_type, day, num_tickets)
+SELECT {COUNT_KEY_SQL}, count(*)
+FROM tickets
+WHERE contact_id IS NOT NULL
+GROUP BY 1, 2, 3, 4;
+"""
+
+DROP_COUNT_TRIGGERS_SQL = """
+DROP TRIGGER ticket_contact_counts_delete ON tickets;
+DROP TRIGGER ticket_contact_counts_update ON tickets;
+DROP TRIGGER ticket_contact_counts_insert ON tickets;
+DROP FUNCTION ticket_contact_counts_trigger();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0001_initial'),
+        ('events', '0001_initial'),
+        ('tickets', '0003_ticket_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactTicketCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket_status', models.CharField(choices=[('OPEN', 'Open'), ('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('BLOCKED', 'Blocked'), ('COMPLETED', 'Completed'), ('CANCELED', 'Canceled')])),
+                ('ticket_type', models.CharField(choices=[('UNKNOWN', 'Unknown'), ('INTRODUCTION', 'Introduction'), ('RECRUIT', 'Recruit for event'), ('CONFIRM', 'Confirm event participation')])),
+                ('day', models.DateField()),
+                ('num_tickets', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'ticket_contact_counts',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['contact', 'ticket_status', 'created_at'], name='tickets_contact_status_idx'),
+        ),
+        migrations.AddField(
+            model_name='contactticketcount',
+            name='contact',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='contacts.contact'),
+        ),
+        migrations.AddConstraint(
+            model_name='contactticketcount',
+            constraint=models.UniqueConstraint(fields=('contact', 'ticket_status', 'ticket_type', 'day'), name='ticket_contact_counts_unique'),
+        ),
+        migrations.RunSQL(COUNT_TRIGGERS_SQL, DROP_COUNT_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_contact_ticket_counts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blocked_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocking_links', to='tickets.ticket')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocked_by_links', to='tickets.ticket')),
+            ],
+            options={
+                'db_table': 'ticket_dependencies',
+                'constraints': [models.UniqueConstraint(fields=('ticket', 'blocked_by'), name='ticket_dependencies_unique'), models.CheckConstraint(condition=models.Q(('ticket', models.F('blocked_by')), _negated=True), name='ticket_dependencies_not_self')],
+            },
+        ),
+    ]
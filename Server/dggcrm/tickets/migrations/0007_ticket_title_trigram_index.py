@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:42
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0001_initial'),
+        ('events', '0001_initial'),
+        ('tickets', '0006_ticket_escalation_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='tickets_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
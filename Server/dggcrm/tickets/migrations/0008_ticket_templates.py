@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+        ('tickets', '0007_ticket_title_trigram_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='TicketTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'ticket_templates',
+            },
+        ),
+        migrations.CreateModel(
+            name='TicketTemplateInstance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_template_instances', to='events.event')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='instances', to='tickets.tickettemplate')),
+            ],
+            options={
+                'db_table': 'ticket_template_instances',
+            },
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='template_instance',
+            field=models.ForeignKey(blank=True, help_text='Template instantiation that created this ticket', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tickets', to='tickets.tickettemplateinstance'),
+        ),
+        migrations.CreateModel(
+            name='TicketTemplateItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('ticket_type', models.CharField(choices=[('UNKNOWN', 'Unknown'), ('INTRODUCTION', 'Introduction'), ('RECRUIT', 'Recruit for event'), ('CONFIRM', 'Confirm event participation')], default='UNKNOWN')),
+                ('title', models.CharField(blank=True, max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('priority', models.PositiveSmallIntegerField(choices=[(0, 'P0 - Emergency (Do Now)'), (1, 'P1 - Very High'), (2, 'P2 - High'), (3, 'P3 - Normal'), (4, 'P4 - Low'), (5, 'P5 - Very Low')], default=3)),
+                ('due_offset', models.DurationField(blank=True, help_text='When the ticket is due relative to the event start', null=True)),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='tickets.tickettemplate')),
+            ],
+            options={
+                'db_table': 'ticket_template_items',
+                'ordering': ['position', 'id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tickettemplateinstance',
+            constraint=models.UniqueConstraint(fields=('template', 'event'), name='ticket_template_instances_unique'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 from auditlog.models import AuditlogHistoryField
 from auditlog.registry import auditlog
@@ -12,6 +14,14 @@ class TicketStatus(models.TextChoices):
     COMPLETED = "COMPLETED", "Completed"
     CANCELED = "CANCELED", "Canceled"
 
+# Statuses of tickets that still need work
+OPEN_TICKET_STATUSES = [
+    TicketStatus.OPEN,
+    TicketStatus.TODO,
+    TicketStatus.INPROGRESS,
+    TicketStatus.BLOCKED,
+]
+
 # TODO: Should we convert to table? 
 class TicketType(models.TextChoices):
     UNKNOWN = "UNKNOWN", "Unknown"
@@ -90,19 +100,40 @@ class Ticket(models.Model):
         default=Priority.P3,
     )
 
+    due_at = models.DateTimeField(null=True, blank=True)
+
+    template_instance = models.ForeignKey(
+        "tickets.TicketTemplateInstance",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="tickets",
+        help_text="Template instantiation that created this ticket",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
 
+    # Maintained by database triggers from title, description and
+    # comment messages (see migration 0003_ticket_search_vector)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     history = AuditlogHistoryField()
 
     class Meta:
         db_table = 'tickets'
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            GinIndex(fields=["title"], opclasses=["gin_trgm_ops"], name="tickets_title_trgm_idx"),
+            models.Index(fields=["contact", "ticket_status", "created_at"], name="tickets_contact_status_idx"),
+            models.Index(fields=["ticket_status", "priority", "modified_at"], name="tickets_escalation_idx"),
+        ]
 
     def __str__(self):
         return f"{self.id} ({self.get_ticket_status_display()})"
 
 # Using django-auditlog to keep history of tickets 
-auditlog.register(Ticket)
+auditlog.register(Ticket, exclude_fields=["search_vector"])
 
 class TicketComment(models.Model):
     ticket = models.ForeignKey(
@@ -130,4 +161,169 @@ class TicketComment(models.Model):
     def __str__(self):
         return f"Comment on {self.ticket_id}"
 
+class TicketDependency(models.Model):
+    """
+    Records that `ticket` cannot progress until `blocked_by` is done.
+    The links form a directed acyclic graph (see tickets.dependencies).
+    """
+    ticket = models.ForeignKey(
+        "tickets.Ticket",
+        on_delete=models.CASCADE,
+        related_name="blocked_by_links",
+    )
+    blocked_by = models.ForeignKey(
+        "tickets.Ticket",
+        on_delete=models.CASCADE,
+        related_name="blocking_links",
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'ticket_dependencies'
+        constraints = [
+            models.UniqueConstraint(fields=["ticket", "blocked_by"], name="ticket_dependencies_unique"),
+            models.CheckConstraint(
+                condition=~models.Q(ticket=models.F("blocked_by")),
+                name="ticket_dependencies_not_self",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ticket_id} blocked by {self.blocked_by_id}"
+
+auditlog.register(TicketDependency)
+
+class ContactTicketCount(models.Model):
+    """
+    Number of tickets per contact, status, type and day of creation.
+    Maintained by database triggers on tickets (see migration
+    0004_contact_ticket_counts) so per-contact reports can sum a few rows
+    instead of counting every ticket.
+    """
+    # No database constraint: rows for a deleted contact are zeroed by the
+    # trigger when its tickets are detached, after the contact is gone
+    contact = models.ForeignKey(
+        "contacts.Contact",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    ticket_status = models.CharField(choices=TicketStatus.choices)
+    ticket_type = models.CharField(choices=TicketType.choices)
+    day = models.DateField()
+    num_tickets = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'ticket_contact_counts'
+        constraints = [
+            models.UniqueConstraint(
+                fields=["contact", "ticket_status", "ticket_type", "day"],
+                name="ticket_contact_counts_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.contact_id} {self.ticket_status} {self.ticket_type} {self.day}: {self.num_tickets}"
+
+class TicketTemplate(models.Model):
+    """
+    A reusable bundle of tickets (e.g. everything needed to run an event)
+    that can be instantiated against an event in one go.
+    """
+    name = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ticket_templates'
+
+    def __str__(self):
+        return self.name
+
+auditlog.register(TicketTemplate)
+
+class TicketTemplateItem(models.Model):
+    template = models.ForeignKey(
+        "tickets.TicketTemplate",
+        on_delete=models.CASCADE,
+        related_name="items",
+    )
+    position = models.PositiveSmallIntegerField(default=0)
+
+    ticket_type = models.CharField(
+        default=TicketType.UNKNOWN,
+        choices=TicketType.choices,
+    )
+    title = models.CharField(max_length=100, blank=True)
+    description = models.TextField(blank=True)
+    priority = models.PositiveSmallIntegerField(
+        choices=Ticket.Priority.choices,
+        default=Ticket.Priority.P3,
+    )
+
+    # Relative to the event's starts_at; negative offsets fall before it
+    due_offset = models.DurationField(
+        null=True,
+        blank=True,
+        help_text="When the ticket is due relative to the event start",
+    )
+
+    class Meta:
+        db_table = 'ticket_template_items'
+        ordering = ["position", "id"]
+
+    def __str__(self):
+        return f"{self.template_id}: {self.title}"
+
+class TicketTemplateInstance(models.Model):
+    """
+    Records that a template was instantiated for an event, so retrying the
+    instantiation returns the same tickets instead of creating new ones.
+    """
+    template = models.ForeignKey(
+        "tickets.TicketTemplate",
+        on_delete=models.CASCADE,
+        related_name="instances",
+    )
+    event = models.ForeignKey(
+        "events.Event",
+        on_delete=models.CASCADE,
+        related_name="ticket_template_instances",
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'ticket_template_instances'
+        constraints = [
+            models.UniqueConstraint(fields=["template", "event"], name="ticket_template_instances_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.template_id} for event {self.event_id}"
+
 # TODO: implement missing tables from DB diagram
\ No newline at end of file
@@ -0,0 +1,116 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ContactTicketCount, Ticket
+
+
+def parse_bound(value):
+    """
+    Parses a report date bound. Plain dates cover the whole day in
+    TIME_ZONE; datetimes are exact. Raises ValueError if invalid.
+    """
+    parsed = parse_date(value) or parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date: {value}")
+    if isinstance(parsed, datetime) and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, ZoneInfo(settings.TIME_ZONE))
+    return parsed
+
+
+def _day_start(day):
+    return datetime.combine(day, time.min, tzinfo=ZoneInfo(settings.TIME_ZONE))
+
+
+def _is_day(bound):
+    return bound is None or not isinstance(bound, datetime)
+
+
+def tickets_per_contact(ticket_status, ticket_type=None, min_date=None, max_date=None, min_tickets=0, max_tickets=None, queryset=None):
+    """
+    Contacts with how many of their tickets created between `min_date` and
+    `max_date` (inclusive) are in `ticket_status`, most tickets first.
+    Only tickets in `queryset` are counted when it is given.
+
+    Reads the precomputed ContactTicketCount buckets when they are enabled,
+    both bounds are whole days and no queryset is given, otherwise counts
+    tickets directly.
+    """
+    if (
+        queryset is None
+        and settings.TICKET_CONTACT_COUNTS_PRECOMPUTED
+        and _is_day(min_date)
+        and _is_day(max_date)
+    ):
+        qs = ContactTicketCount.objects.filter(num_tickets__gt=0)
+        if min_date is not None:
+            qs = qs.filter(day__gte=min_date)
+        if max_date is not None:
+            qs = qs.filter(day__lte=max_date)
+        counted = "num_tickets"
+        aggregate = Sum
+    else:
+        qs = (Ticket.objects.all() if queryset is None else queryset).filter(contact__isnull=False)
+        if min_date is not None:
+            qs = qs.filter(created_at__gte=_day_start(min_date) if _is_day(min_date) else min_date)
+        if max_date is not None:
+            if _is_day(max_date):
+                qs = qs.filter(created_at__lt=_day_start(max_date + timedelta(days=1)))
+            else:
+                qs = qs.filter(created_at__lte=max_date)
+        counted = "id"
+        aggregate = Count
+
+    if ticket_type:
+        qs = qs.filter(ticket_type=ticket_type)
+
+    if min_tickets > 0:
+        # Contacts without a ticket in this status cannot qualify, so only
+        # their rows need to be read
+        qs = qs.filter(ticket_status=ticket_status)
+        ticket_count = aggregate(counted)
+    else:
+        ticket_count = Coalesce(aggregate(counted, filter=Q(ticket_status=ticket_status)), 0)
+
+    qs = (
+        qs.values("contact_id", full_name=F("contact__full_name"))
+        .annotate(ticket_count=ticket_count)
+        .filter(ticket_count__gte=min_tickets)
+        .order_by("-ticket_count", "contact_id")
+    )
+
+    if max_tickets is not None:
+        qs = qs.filter(ticket_count__lte=max_tickets)
+
+    return qs
+
+
+def rebuild_contact_ticket_counts():
+    """
+    Recomputes every ContactTicketCount bucket from the tickets table.
+    Ticket writes wait while this runs; reads are not blocked.
+    Returns the number of buckets written.
+    """
+    counts_table = connection.ops.quote_name(ContactTicketCount._meta.db_table)
+    tickets_table = connection.ops.quote_name(Ticket._meta.db_table)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {tickets_table} IN SHARE MODE")
+        cursor.execute(f"DELETE FROM {counts_table}")
+        cursor.execute(
+            f"""
+            INSERT INTO {counts_table} (contact_id, ticket_status, ticket_type, day, num_tickets)
+            SELECT contact_id, ticket_status, ticket_type, (created_at AT TIME ZONE %s)::date, count(*)
+            FROM {tickets_table}
+            WHERE contact_id IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+            """,
+            [settings.TIME_ZONE],
+        )
+        return cursor.rowcount
@@ -1,10 +1,16 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Ticket, TicketStatus, TicketComment
+from django.db.models import F
+from dggcrm.accounts.scopes import ScopedRelatedFieldsMixin
+from dggcrm.contacts.models import Tag
+from dggcrm.events.models import Event, CommitmentStatus
+
+from .assignment import LEAST_LOADED, STRATEGIES
+from .models import Ticket, TicketStatus, TicketType, TicketComment, TicketDependency, TicketTemplate, TicketTemplateItem
 
 User = get_user_model()
 
-class TicketSerializer(serializers.ModelSerializer):
+class TicketSerializer(ScopedRelatedFieldsMixin, serializers.ModelSerializer):
     status_display = serializers.CharField(
         source='get_ticket_status_display',
         read_only=True
@@ -28,14 +34,174 @@ class TicketSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ticket
-        fields = "__all__"
-        read_only_fields = ['id', 'created_at', 'modified_at', 'status_display', 'type_display', 'assigned_to_username', 'reported_by_username', 'priority_display', 'reported_by']
+        exclude = ['search_vector']
+        read_only_fields = ['id', 'created_at', 'modified_at', 'status_display', 'type_display', 'assigned_to_username', 'reported_by_username', 'priority_display', 'reported_by', 'template_instance']
+
+
+# Lookup tables and columns for compact_ticket_data(), which must produce
+# exactly what TicketSerializer does for the same tickets
+TICKET_STATUS_LABELS = dict(TicketStatus.choices)
+TICKET_TYPE_LABELS = dict(TicketType.choices)
+TICKET_PRIORITY_LABELS = dict(Ticket.Priority.choices)
+
+COMPACT_TICKET_COLUMNS = [
+    "id", "ticket_status", "ticket_type", "title", "description", "priority", "due_at",
+    "created_at", "modified_at", "event_id", "contact_id", "assigned_to_id", "reported_by_id",
+    "template_instance_id",
+]
+
+_datetime_field = serializers.DateTimeField()
+
+
+def compact_ticket_rows(queryset):
+    """
+    Only the columns needed to represent the tickets in `queryset`, with
+    the assignee and reporter usernames joined in.
+    """
+    return queryset.values(
+        *COMPACT_TICKET_COLUMNS,
+        assigned_to_username=F("assigned_to__username"),
+        reported_by_username=F("reported_by__username"),
+    )
+
+
+def compact_ticket_data(rows):
+    """
+    TicketSerializer(many=True).data for rows from compact_ticket_rows(),
+    without building model instances or running serializer fields.
+    """
+    to_datetime = _datetime_field.to_representation
+    data = []
+    for row in rows:
+        item = {
+            "id": row["id"],
+            "status_display": TICKET_STATUS_LABELS.get(row["ticket_status"], row["ticket_status"]),
+            "type_display": TICKET_TYPE_LABELS.get(row["ticket_type"], row["ticket_type"]),
+        }
+        # TicketSerializer leaves these out when there is no user
+        if row["assigned_to_id"] is not None:
+            item["assigned_to_username"] = row["assigned_to_username"]
+        if row["reported_by_id"] is not None:
+            item["reported_by_username"] = row["reported_by_username"]
+        item.update({
+            "priority_display": TICKET_PRIORITY_LABELS.get(row["priority"], row["priority"]),
+            "ticket_status": row["ticket_status"],
+            "ticket_type": row["ticket_type"],
+            "title": row["title"],
+            "description": row["description"],
+            "priority": row["priority"],
+            "due_at": to_datetime(row["due_at"]) if row["due_at"] is not None else None,
+            "created_at": to_datetime(row["created_at"]),
+            "modified_at": to_datetime(row["modified_at"]),
+            "event": row["event_id"],
+            "contact": row["contact_id"],
+            "assigned_to": row["assigned_to_id"],
+            "reported_by": row["reported_by_id"],
+            "template_instance": row["template_instance_id"],
+        })
+        data.append(item)
+    return data
 
 
 class TicketClaimSerializer(serializers.Serializer):
     pass
 
 
+class TicketGenerateSerializer(ScopedRelatedFieldsMixin, serializers.Serializer):
+    """
+    Segment to generate tickets for: either an event and a participation
+    status, or a tag (id or name). An event can be given with a tag to
+    link the generated tickets to it.
+    """
+    ticket_type = serializers.ChoiceField(choices=TicketType.choices)
+    event = serializers.PrimaryKeyRelatedField(
+        queryset=Event.objects.all(),
+        required=False,
+        allow_null=True,
+    )
+    participation_status = serializers.ChoiceField(
+        choices=CommitmentStatus.choices,
+        required=False,
+    )
+    tag = serializers.CharField(required=False)
+
+    title = serializers.CharField(max_length=100, required=False, allow_blank=True, default="")
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    priority = serializers.ChoiceField(choices=Ticket.Priority.choices, default=Ticket.Priority.P3)
+
+    def validate_tag(self, value):
+        tags = Tag.objects.all()
+        tag = tags.filter(id=value).first() if value.isdigit() else tags.filter(name__iexact=value).first()
+        if tag is None:
+            raise serializers.ValidationError("Unknown tag")
+        return tag
+
+    def validate(self, attrs):
+        if attrs.get("tag") is None:
+            if attrs.get("event") is None or "participation_status" not in attrs:
+                raise serializers.ValidationError(
+                    "Provide either a tag or an event and a participation_status"
+                )
+        return attrs
+
+
+class TicketBalanceSerializer(ScopedRelatedFieldsMixin, serializers.Serializer):
+    """
+    Unassigned tickets to distribute (those of an event and/or a list of
+    ids) and the users to distribute them to. Users default to the
+    event's members.
+    """
+    event = serializers.PrimaryKeyRelatedField(
+        queryset=Event.objects.all(),
+        required=False,
+        allow_null=True,
+    )
+    # Plain ids, looked up with one query each rather than one per id
+    tickets = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+    )
+    users = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+    )
+    strategy = serializers.ChoiceField(choices=STRATEGIES, default=LEAST_LOADED)
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+    @staticmethod
+    def _missing(ids, found):
+        missing = [pk for pk in dict.fromkeys(ids) if pk not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f"Objects do not exist: {', '.join(map(str, missing))}"
+            )
+
+    def validate_tickets(self, ids):
+        tickets = self.scope_queryset(Ticket.objects.filter(id__in=ids))
+        found = set(tickets.values_list("id", flat=True))
+        self._missing(ids, found)
+        return list(dict.fromkeys(ids))
+
+    def validate_users(self, ids):
+        users = {user.id: user for user in User.objects.filter(id__in=ids, is_active=True)}
+        self._missing(ids, users)
+        return [users[pk] for pk in dict.fromkeys(ids)]
+
+    def validate(self, attrs):
+        if attrs.get("event") is None and not attrs.get("tickets"):
+            raise serializers.ValidationError("Provide an event and/or a list of tickets")
+
+        if not attrs.get("users"):
+            if attrs.get("event") is None:
+                raise serializers.ValidationError("Provide users to assign to")
+            attrs["users"] = list(
+                User.objects.filter(events__event=attrs["event"], is_active=True)
+            )
+            if not attrs["users"]:
+                raise serializers.ValidationError("The event has no members to assign to")
+        return attrs
+
+
 class TicketCommentSerializer(serializers.ModelSerializer):
     author_display = serializers.CharField(
         source="author.get_full_name",
@@ -56,10 +222,57 @@ class TicketCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ["author", "created_at", "modified_at"]
 
 
+class TicketDependencySerializer(ScopedRelatedFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = TicketDependency
+        fields = ["id", "ticket", "blocked_by", "created_by", "created_at"]
+        read_only_fields = ["ticket", "created_by", "created_at"]
+
+
 class TicketTimelineSerializer(serializers.Serializer):
     type = serializers.CharField()
     created_at = serializers.DateTimeField()
     actor_display = serializers.CharField(allow_null=True)
     actor_id = serializers.IntegerField(allow_null=True)
     message = serializers.CharField(allow_null=True, required=False)
-    changes = serializers.JSONField(allow_null=True, required=False)
\ No newline at end of file
+    changes = serializers.JSONField(allow_null=True, required=False)
+
+
+class TicketTemplateItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TicketTemplateItem
+        fields = ["id", "position", "ticket_type", "title", "description", "priority", "due_offset"]
+
+
+class TicketTemplateSerializer(serializers.ModelSerializer):
+    """
+    A template with its items. Writing `items` replaces all of them.
+    """
+    items = TicketTemplateItemSerializer(many=True)
+
+    class Meta:
+        model = TicketTemplate
+        fields = ["id", "name", "description", "items", "created_by", "created_at", "modified_at"]
+        read_only_fields = ["created_by", "created_at", "modified_at"]
+
+    def create(self, validated_data):
+        items = validated_data.pop("items")
+        template = TicketTemplate.objects.create(**validated_data)
+        TicketTemplateItem.objects.bulk_create(
+            TicketTemplateItem(template=template, **item) for item in items
+        )
+        return template
+
+    def update(self, instance, validated_data):
+        items = validated_data.pop("items", None)
+        instance = super().update(instance, validated_data)
+        if items is not None:
+            instance.items.all().delete()
+            TicketTemplateItem.objects.bulk_create(
+                TicketTemplateItem(template=instance, **item) for item in items
+            )
+        return instance
+
+
+class TicketTemplateInstantiateSerializer(ScopedRelatedFieldsMixin, serializers.Serializer):
+    event = serializers.PrimaryKeyRelatedField(queryset=Event.objects.all())
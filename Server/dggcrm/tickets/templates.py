@@ -0,0 +1,57 @@
+from auditlog import get_logentry_model
+from auditlog.diff import model_instance_diff
+from django.conf import settings
+from django.db import transaction
+
+from dggcrm.audit.buffer import bulk_log
+
+from .models import Ticket, TicketStatus, TicketTemplateInstance
+
+
+def instantiate_template(template, event, reported_by=None, audit_context=None):
+    """
+    Creates a ticket for every item of `template` against `event` with a
+    single bulk INSERT, due `due_offset` after the event starts.
+
+    Each (template, event) pair is instantiated at most once; repeating the
+    call returns the tickets from the first time. Returns the instance,
+    its tickets and whether they were created now.
+    """
+    with transaction.atomic():
+        # A concurrent instantiation of the same pair waits on the unique
+        # constraint and then finds this one's instance
+        instance, created = TicketTemplateInstance.objects.get_or_create(
+            template=template,
+            event=event,
+            defaults={"created_by": reported_by},
+        )
+        if not created:
+            return instance, list(instance.tickets.order_by("id")), False
+
+        tickets = Ticket.objects.bulk_create([
+            Ticket(
+                ticket_status=TicketStatus.OPEN,
+                ticket_type=item.ticket_type,
+                event=event,
+                reported_by=reported_by,
+                title=item.title,
+                description=item.description,
+                priority=item.priority,
+                due_at=event.starts_at + item.due_offset if item.due_offset is not None else None,
+                template_instance=instance,
+            )
+            for item in template.items.all()
+        ])
+
+        use_json = settings.AUDITLOG_STORE_JSON_CHANGES
+        bulk_log(
+            Ticket,
+            [
+                (ticket.pk, str(ticket), model_instance_diff(None, ticket, use_json_for_changes=use_json))
+                for ticket in tickets
+            ],
+            get_logentry_model().Action.CREATE,
+            **(audit_context or {}),
+        )
+
+    return instance, tickets, True
@@ -0,0 +1,197 @@
+import json
+from datetime import timedelta
+
+from auditlog.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from dggcrm.contacts.models import Contact
+from dggcrm.events.models import Event
+
+from .models import Ticket, TicketDependency, TicketStatus, TicketType
+from .serializers import TicketSerializer, compact_ticket_data, compact_ticket_rows
+
+User = get_user_model()
+
+
+class CompactTicketDataTests(TestCase):
+    """
+    compact_ticket_data() stands in for TicketSerializer on list endpoints,
+    so their JSON must not drift apart when a field changes.
+    """
+
+    def test_matches_ticket_serializer(self):
+        now = timezone.now()
+        user = User.objects.create_user(username="organizer", password="unused")
+        event = Event.objects.create(name="Canvass", starts_at=now, ends_at=now + timedelta(hours=2))
+        contact = Contact.objects.create(full_name="Jane Doe")
+        Ticket.objects.create(
+            title="Call Jane",
+            description="About the canvass",
+            ticket_type=TicketType.RECRUIT,
+            ticket_status=TicketStatus.INPROGRESS,
+            due_at=now + timedelta(days=1),
+            event=event,
+            contact=contact,
+            assigned_to=user,
+            reported_by=user,
+        )
+        Ticket.objects.create(title="Unassigned, without contact or event")
+
+        tickets = Ticket.objects.order_by("id")
+        self.assertEqual(
+            json.dumps(compact_ticket_data(compact_ticket_rows(tickets))),
+            json.dumps(TicketSerializer(tickets, many=True).data),
+        )
+
+
+class TicketBoardTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="organizer", password="unused", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        created_at = timezone.now()
+        for priority in (3, 1, 3, 3, 5):
+            Ticket.objects.create(title="To do", ticket_status=TicketStatus.TODO, priority=priority)
+        for priority in (2, 4, 3):
+            Ticket.objects.create(title="In progress", ticket_status=TicketStatus.INPROGRESS, priority=priority)
+        # Ties on priority and created_at are broken by id
+        Ticket.objects.update(created_at=created_at)
+
+    def board(self, **params):
+        response = self.client.get("/api/tickets/board/", {"limit": 2, **params})
+        self.assertEqual(response.status_code, 200)
+        return {column["status"]: column for column in response.json()["columns"]}
+
+    def ticket_ids(self, column):
+        return [ticket["id"] for ticket in column["tickets"]]
+
+    def test_column_cursor_pages_one_column(self):
+        first = self.board()
+        todo = list(
+            Ticket.objects.filter(ticket_status=TicketStatus.TODO)
+            .order_by("priority", "created_at", "id")
+            .values_list("id", flat=True)
+        )
+
+        seen = self.ticket_ids(first[TicketStatus.TODO])
+        cursor = first[TicketStatus.TODO]["next_cursor"]
+        while cursor:
+            columns = self.board(**{f"cursor_{TicketStatus.TODO}": cursor})
+            self.assertEqual(columns[TicketStatus.TODO]["total"], 5)
+            seen += self.ticket_ids(columns[TicketStatus.TODO])
+            cursor = columns[TicketStatus.TODO]["next_cursor"]
+
+            # The other columns start from the top on every page
+            for status in (TicketStatus.INPROGRESS, TicketStatus.BLOCKED):
+                self.assertEqual(columns[status], first[status])
+
+        self.assertEqual(seen, todo)
+        self.assertEqual(first[TicketStatus.INPROGRESS]["total"], 3)
+        self.assertEqual(len(first[TicketStatus.INPROGRESS]["tickets"]), 2)
+        self.assertIsNotNone(first[TicketStatus.INPROGRESS]["next_cursor"])
+        self.assertEqual(first[TicketStatus.BLOCKED], {
+            "status": TicketStatus.BLOCKED,
+            "status_display": TicketStatus.BLOCKED.label,
+            "total": 0,
+            "tickets": [],
+            "next_cursor": None,
+        })
+
+
+class TicketDependencyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="organizer", password="unused", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def ticket(self, title, ticket_status=TicketStatus.TODO):
+        return Ticket.objects.create(title=title, ticket_status=ticket_status)
+
+    def depend(self, ticket, blocked_by):
+        return self.client.post(
+            f"/api/tickets/{ticket.id}/dependencies/", {"blocked_by": blocked_by.id}, format="json",
+        )
+
+    def test_ticket_cannot_block_itself(self):
+        ticket = self.ticket("Book the venue")
+        self.assertEqual(self.depend(ticket, ticket).status_code, 400)
+
+    def test_direct_cycle_is_refused(self):
+        venue, flyers = self.ticket("Book the venue"), self.ticket("Print flyers")
+        self.assertEqual(self.depend(flyers, venue).status_code, 201)
+
+        response = self.depend(venue, flyers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("blocked_by", response.json())
+        self.assertFalse(TicketDependency.objects.filter(ticket=venue).exists())
+
+    def test_transitive_cycle_is_refused(self):
+        venue, flyers, canvass = self.ticket("Book the venue"), self.ticket("Print flyers"), self.ticket("Canvass")
+        self.assertEqual(self.depend(flyers, venue).status_code, 201)
+        self.assertEqual(self.depend(canvass, flyers).status_code, 201)
+
+        self.assertEqual(self.depend(venue, canvass).status_code, 400)
+        self.assertFalse(TicketDependency.objects.filter(ticket=venue).exists())
+
+    def test_blocked_lists_the_transitive_closure(self):
+        venue, flyers, canvass, unrelated = (
+            self.ticket("Book the venue"), self.ticket("Print flyers"), self.ticket("Canvass"), self.ticket("Unrelated"),
+        )
+        TicketDependency.objects.create(ticket=flyers, blocked_by=venue)
+        TicketDependency.objects.create(ticket=canvass, blocked_by=flyers)
+        TicketDependency.objects.create(ticket=unrelated, blocked_by=canvass)
+
+        response = self.client.get(f"/api/tickets/{flyers.id}/blocked/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row["id"] for row in response.json()["results"]}, {canvass.id, unrelated.id})
+
+        response = self.client.get(f"/api/tickets/{venue.id}/blocked/")
+        self.assertEqual({row["id"] for row in response.json()["results"]}, {flyers.id, canvass.id, unrelated.id})
+
+    def test_remove_dependency_needs_a_ticket_id(self):
+        venue, flyers = self.ticket("Book the venue"), self.ticket("Print flyers")
+        TicketDependency.objects.create(ticket=flyers, blocked_by=venue)
+
+        for query in ("", "?blocked_by=abc"):
+            response = self.client.delete(f"/api/tickets/{flyers.id}/dependencies/{query}")
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("blocked_by", response.json())
+
+        response = self.client.delete(f"/api/tickets/{flyers.id}/dependencies/?blocked_by={venue.id}")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(TicketDependency.objects.exists())
+
+    def test_completing_a_blocker_releases_only_blocked_dependents(self):
+        venue = self.ticket("Book the venue", TicketStatus.INPROGRESS)
+        flyers = self.ticket("Print flyers", TicketStatus.BLOCKED)
+        canvass = self.ticket("Canvass", TicketStatus.INPROGRESS)
+        # Still waiting on another open ticket
+        phonebank = self.ticket("Phonebank", TicketStatus.BLOCKED)
+        volunteers = self.ticket("Recruit volunteers")
+        for ticket in (flyers, canvass, phonebank):
+            TicketDependency.objects.create(ticket=ticket, blocked_by=venue)
+        TicketDependency.objects.create(ticket=phonebank, blocked_by=volunteers)
+
+        response = self.client.patch(
+            f"/api/tickets/{venue.id}/", {"ticket_status": TicketStatus.COMPLETED}, format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        statuses = dict(Ticket.objects.values_list("id", "ticket_status"))
+        self.assertEqual(statuses[flyers.id], TicketStatus.TODO)
+        self.assertEqual(statuses[canvass.id], TicketStatus.INPROGRESS)
+        self.assertEqual(statuses[phonebank.id], TicketStatus.BLOCKED)
+
+        entries = LogEntry.objects.filter(
+            content_type=ContentType.objects.get_for_model(Ticket),
+            object_pk__in=[str(flyers.id), str(phonebank.id)],
+            action=LogEntry.Action.UPDATE,
+        )
+        self.assertEqual([entry.object_pk for entry in entries], [str(flyers.id)])
+        self.assertEqual(entries[0].actor, self.user)
+        self.assertEqual(entries[0].changes_dict["ticket_status"], [TicketStatus.BLOCKED, TicketStatus.TODO])
@@ -1,9 +1,10 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
-from .views import TicketViewSet
+from .views import TicketViewSet, TicketTemplateViewSet
 
 router = DefaultRouter()
 router.register('tickets', TicketViewSet, basename='ticket')
+router.register('ticket-templates', TicketTemplateViewSet, basename='ticket-template')
 
 urlpatterns = [
     path('', include(router.urls)),
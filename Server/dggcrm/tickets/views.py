@@ -1,26 +1,79 @@
 from rest_framework import viewsets, filters
-from rest_framework.exceptions import APIException
+from rest_framework.exceptions import APIException, ValidationError
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from auditlog.models import LogEntry
 
+from django.conf import settings
 from django.http import HttpResponseBadRequest
-from django.db.models import Count, Q, F
 from django.contrib.contenttypes.models import ContentType
 
-from .models import Ticket, TicketStatus, TicketType, TicketComment
-from .serializers import TicketSerializer, TicketClaimSerializer, TicketCommentSerializer, TicketTimelineSerializer
+from dggcrm.accounts.scopes import IsOrganizer, IsOrganizerOrReadOnly, ScopedQuerysetMixin, access_scope
+from dggcrm.audit.buffer import audit_context, pending_entries_for
+from dggcrm.audit.mixins import BufferedAuditMixin
+from dggcrm.concurrency.mixins import ConditionalUpdateMixin
+from dggcrm.db.mixins import TransactionPolicyMixin
+from dggcrm.idempotency.mixins import IdempotentMixin
+from dggcrm.notifications.models import NotificationEvent
+from dggcrm.notifications.outbox import notify_watchers
+
+from .models import Ticket, TicketStatus, TicketType, TicketComment, TicketDependency, TicketTemplate
+from .assignment import balance_tickets
+from .board import board_columns, decode_cursor, encode_cursor
+from .duplicates import similar_tickets
+from .dependencies import DependencyCycleError, RESOLVED_TICKET_STATUSES, add_dependency, release_dependents, transitively_blocked
+from .filters import TicketFullTextFilter
+from .generation import generate_tickets
+from .reports import parse_bound, tickets_per_contact
+from .templates import instantiate_template
+from .serializers import TicketSerializer, TicketClaimSerializer, TicketCommentSerializer, TicketTimelineSerializer, TicketGenerateSerializer, TicketDependencySerializer, TicketBalanceSerializer, TicketTemplateSerializer, TicketTemplateInstantiateSerializer, compact_ticket_data, compact_ticket_rows
+
+class DuplicateTicket(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A similar open ticket already exists."
+    default_code = "duplicate_ticket"
+
+
+def similar_ticket_data(tickets):
+    """
+    Serialized candidates from similar_tickets(), with their similarity.
+    """
+    tickets = list(tickets.select_related("assigned_to", "reported_by"))
+    data = TicketSerializer(tickets, many=True).data
+    for item, ticket in zip(data, tickets):
+        item["similarity"] = round(ticket.similarity, 3)
+    return data
+
+
+# Default and maximum tickets per column on the board
+BOARD_LIMIT = 25
+BOARD_MAX_LIMIT = 100
+
 
 # TODO: Handle permissions for views in file
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(TransactionPolicyMixin, IdempotentMixin, ConditionalUpdateMixin, BufferedAuditMixin, ScopedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Ticket.objects.all().order_by('-created_at')
     serializer_class = TicketSerializer
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, filters.SearchFilter, TicketFullTextFilter]
     search_fields = ['id', 'title']
     ordering_fields = ['priority', 'created_at', 'modified_at', 'ticket_status', 'ticket_type', ]
     ordering = ['priority', '-created_at']
 
+    def list(self, request, *args, **kwargs):
+        """
+        Same response as ModelViewSet.list, built from values() rows
+        instead of model instances run through TicketSerializer.
+        """
+        queryset = compact_ticket_rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compact_ticket_data(page))
+
+        return Response(compact_ticket_data(queryset))
+
     def get_queryset(self):
         queryset = super().get_queryset()
 
@@ -62,53 +115,190 @@ class TicketViewSet(viewsets.ModelViewSet):
     # TODO: Limit this API to organizer role or above
     @action(detail=False, methods=["get"])
     def group_by_contact(self, request):
-        min_date = request.query_params.get("min_date")
-        max_date = request.query_params.get("max_date")
-        min_tickets = int(request.query_params.get("min_tickets", 0))
-        max_tickets = request.query_params.get("max_tickets")
-
-        ticket_status = self.request.query_params.get("status", TicketStatus.COMPLETED)
+        """
+        GET /tickets/group_by_contact/?status=COMPLETED&type=RECRUIT&min_date=2025-01-01&max_date=2025-06-30
+        Contacts ranked by how many of their tickets have a status.
+        Dates are inclusive; plain dates cover the whole day.
+        """
+        ticket_status = request.query_params.get("status", TicketStatus.COMPLETED)
         ticket_type = request.query_params.get("type")
 
-        qs = (
-            Ticket.objects
-            .filter(
-                contact__isnull=False,
-            )
+        try:
+            bounds = {
+                name: parse_bound(request.query_params[name])
+                for name in ("min_date", "max_date")
+                if request.query_params.get(name)
+            }
+        except ValueError as e:
+            raise ValidationError({"date": str(e)})
+
+        try:
+            min_tickets = int(request.query_params.get("min_tickets", 0))
+            max_tickets = request.query_params.get("max_tickets")
+            max_tickets = int(max_tickets) if max_tickets is not None else None
+        except ValueError:
+            raise ValidationError({"tickets": "min_tickets and max_tickets must be integers"})
+
+        # Unrestricted users can be served from the precomputed counts
+        scope = access_scope(request)
+        qs = tickets_per_contact(
+            ticket_status,
+            ticket_type=ticket_type,
+            min_tickets=min_tickets,
+            max_tickets=max_tickets,
+            queryset=None if scope.unrestricted else scope.filter(Ticket.objects.all()),
+            **bounds,
         )
 
-        # Query date ranges
-        if min_date:
-            qs.filter(created_at__gte=min_date)
-        if max_date:
-            qs.filter(created_at__lte=max_date)
-
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            return self.get_paginated_response(page)
 
-        if ticket_type:
-            qs = qs.filter(ticket_type=type)
+        return Response(qs)
 
-        qs = (
-            qs.values("contact_id", full_name=F("contact__full_name"))
-            .annotate(
-                ticket_count=Count(
-                    "id",
-                    filter=Q(ticket_status=ticket_status),
-                )
+    @action(detail=False, methods=["get"])
+    def similar(self, request):
+        """
+        GET /tickets/similar/?title=Introduce to Alex&contact=12&event=3&type=INTRODUCTION
+        Open tickets for the same contact and/or event with a similar title,
+        most similar first. Pass exclude=<ticket_id> when editing a ticket.
+        """
+        params = request.query_params
+        if not params.get("contact") and not params.get("event"):
+            raise ValidationError({"contact": "contact or event is required"})
+
+        try:
+            tickets = similar_tickets(
+                params.get("title", ""),
+                contact=int(params["contact"]) if params.get("contact") else None,
+                event=int(params["event"]) if params.get("event") else None,
+                ticket_type=params.get("type"),
+                exclude=int(params["exclude"]) if params.get("exclude") else None,
+                queryset=access_scope(request).filter(Ticket.objects.all()),
             )
-            .filter(ticket_count__gte=min_tickets)
-            .order_by("-ticket_count", "contact_id")
-        )
+        except ValueError:
+            raise ValidationError({"detail": "contact, event and exclude must be integers"})
 
-        if max_tickets is not None:
-            qs = qs.filter(ticket_count__lte=int(max_tickets))
+        return Response(similar_ticket_data(tickets))
 
+    @action(detail=False, methods=["get"])
+    def board(self, request):
+        """
+        GET /tickets/board/?limit=25
+        The first tickets of every status column with column totals, in one
+        query. Accepts the list filters; pass a column's next_cursor as
+        cursor_<STATUS> (e.g. cursor_TODO=...) to load more of that column.
+        """
+        try:
+            limit = min(int(request.query_params.get("limit", BOARD_LIMIT)), BOARD_MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer"})
+        if limit < 1:
+            raise ValidationError({"limit": "Must be at least 1"})
+
+        ticket_status = request.query_params.get("status")
+        statuses = [ticket_status] if ticket_status in TicketStatus.values else TicketStatus.values
+
+        cursors = {}
+        for column_status in statuses:
+            cursor = request.query_params.get(f"cursor_{column_status}")
+            if cursor:
+                try:
+                    cursors[column_status] = decode_cursor(cursor)
+                except ValueError as e:
+                    raise ValidationError({f"cursor_{column_status}": str(e)})
+
+        queryset = self.filter_queryset(self.get_queryset()).select_related("assigned_to", "reported_by")
+        columns = board_columns(queryset, limit, cursors=cursors, statuses=statuses)
+
+        return Response({
+            "columns": [
+                {
+                    "status": column_status,
+                    "status_display": TicketStatus(column_status).label,
+                    "total": column["total"],
+                    "tickets": TicketSerializer(column["tickets"], many=True).data,
+                    "next_cursor": encode_cursor(column["tickets"][-1]) if column["has_more"] else None,
+                }
+                for column_status, column in columns.items()
+            ]
+        })
+
+    # Segments by tag reach contacts outside a volunteer's scope
+    @action(
+        detail=False,
+        methods=["post"],
+        serializer_class=TicketGenerateSerializer,
+        permission_classes=[IsAuthenticated, IsOrganizer],
+    )
+    def generate(self, request):
+        """
+        POST /tickets/generate/
+        Creates a ticket for every contact in a segment (event participants
+        with a status, or contacts with a tag), skipping contacts that
+        already have an open ticket of that type for the event.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        page = self.paginate_queryset(qs)
-        if page is not None:
-            return self.get_paginated_response(page)
+        user = request.user
+        tickets = generate_tickets(
+            reported_by=user if user.is_authenticated else None,
+            audit_context=audit_context(request),
+            **serializer.validated_data,
+        )
 
-        return Response(qs)
+        return Response(
+            {
+                "created": len(tickets),
+                "ids": [ticket.id for ticket in tickets],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    # Assigns tickets to any user, not only the caller
+    @action(
+        detail=False,
+        methods=["post"],
+        serializer_class=TicketBalanceSerializer,
+        permission_classes=[IsAuthenticated, IsOrganizer],
+    )
+    def balance(self, request):
+        """
+        POST /tickets/balance/ {"event": 3, "strategy": "least_loaded"}
+        Distributes unassigned open tickets across users (the event's
+        members by default) and reports each user's resulting load.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        queryset = access_scope(request).filter(Ticket.objects.all())
+        if data.get("event") is not None:
+            queryset = queryset.filter(event=data["event"])
+        if data.get("tickets"):
+            queryset = queryset.filter(id__in=data["tickets"])
+
+        users = {user.id: user for user in data["users"]}
+        tickets, distribution = balance_tickets(
+            queryset,
+            list(users),
+            strategy=data["strategy"],
+            limit=data.get("limit"),
+            audit_context=audit_context(request),
+        )
+
+        user = request.user
+        notify_watchers(tickets, NotificationEvent.ASSIGNED, actor=user if user.is_authenticated else None)
 
+        return Response({
+            "strategy": data["strategy"],
+            "assigned": len(tickets),
+            "distribution": [
+                {"user": user_id, "username": users[user_id].username, **counts}
+                for user_id, counts in distribution.items()
+            ],
+        })
 
     @action(detail=True, methods=['post', 'delete'], url_path='claim', serializer_class=TicketClaimSerializer,)
     def claim(self, request, pk=None):
@@ -129,6 +319,7 @@ class TicketViewSet(viewsets.ModelViewSet):
             # TODO: limit claiming of already claimed tickets
             ticket.assigned_to = request.user
             ticket.save(update_fields=["assigned_to"])
+            notify_watchers([ticket], NotificationEvent.ASSIGNED, actor=request.user)
 
         serializer = TicketSerializer(ticket, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -147,10 +338,73 @@ class TicketViewSet(viewsets.ModelViewSet):
             ticket=ticket,
             author=request.user if request.user.is_authenticated else None,
         )
+        notify_watchers([ticket], NotificationEvent.COMMENTED, actor=comment.author, message=comment.message)
 
         return Response(TicketCommentSerializer(comment, context={'request': request}).data, status=status.HTTP_201_CREATED)
 
 
+    @action(detail=True, methods=["get", "post", "delete"], serializer_class=TicketDependencySerializer)
+    def dependencies(self, request, pk=None):
+        """
+        GET /tickets/<ticket_id>/dependencies/
+        Tickets this one is blocked by and the tickets it directly blocks.
+
+        POST /tickets/<ticket_id>/dependencies/ {"blocked_by": <ticket_id>}
+        DELETE /tickets/<ticket_id>/dependencies/?blocked_by=<ticket_id>
+        """
+        ticket = self.get_object()
+
+        if request.method == "POST":
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            try:
+                dependency, created = add_dependency(
+                    ticket,
+                    serializer.validated_data["blocked_by"],
+                    created_by=request.user if request.user.is_authenticated else None,
+                )
+            except DependencyCycleError as e:
+                raise ValidationError({"blocked_by": str(e)})
+            return Response(
+                self.get_serializer(dependency).data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            )
+
+        if request.method == "DELETE":
+            serializer = self.get_serializer(data=request.query_params)
+            serializer.is_valid(raise_exception=True)
+            blocked_by = serializer.validated_data["blocked_by"]
+            for dependency in TicketDependency.objects.filter(ticket=ticket, blocked_by=blocked_by):
+                dependency.delete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        visible = access_scope(request).filter(Ticket.objects.all())
+        ordering = ("priority", "-created_at")
+        return Response({
+            "blocked_by": compact_ticket_data(
+                compact_ticket_rows(visible.filter(blocking_links__ticket=ticket).order_by(*ordering))
+            ),
+            "blocking": compact_ticket_data(
+                compact_ticket_rows(visible.filter(blocked_by_links__blocked_by=ticket).order_by(*ordering))
+            ),
+        })
+
+    @action(detail=True, methods=["get"])
+    def blocked(self, request, pk=None):
+        """
+        GET /tickets/<ticket_id>/blocked/
+        Every ticket blocked by this one, directly or through other tickets.
+        """
+        ticket = self.get_object()
+        queryset = access_scope(request).filter(transitively_blocked(ticket))
+        queryset = compact_ticket_rows(queryset.order_by("priority", "-created_at"))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compact_ticket_data(page))
+
+        return Response(compact_ticket_data(queryset))
+
     @action(detail=True, methods=["get"])
     def timeline(self, request, pk=None):
         ticket = self.get_object()
@@ -162,10 +416,12 @@ class TicketViewSet(viewsets.ModelViewSet):
         comments = []
 
         if show_type in ["audit", "both"]:
-            audit_entries = LogEntry.objects.filter(
+            audit_entries = list(LogEntry.objects.filter(
                 content_type=ContentType.objects.get_for_model(Ticket),
                 object_pk=ticket.pk,
-            )
+            ))
+            # Entries still waiting in the audit outbox (batched audit mode)
+            audit_entries += pending_entries_for(ticket)
 
         if show_type in ["comment", "both"]:
             comments = ticket.comments.all()
@@ -203,9 +459,95 @@ class TicketViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+    def create(self, request, *args, **kwargs):
+        """
+        Creates the ticket, listing open tickets it may duplicate under
+        "similar_tickets". With ?on_duplicate=reject (or
+        TICKET_DUPLICATE_ACTION = "reject") it is refused with a 409 instead.
+        """
+        response = super().create(request, *args, **kwargs)
+        if self._similar_tickets:
+            response.data["similar_tickets"] = self._similar_tickets
+        return response
+
     def perform_create(self, serializer):
         """
         Automatically sets reported_by to the current authenticated user.
         """
+        data = serializer.validated_data
+        self._similar_tickets = similar_ticket_data(similar_tickets(
+            data.get("title"),
+            contact=data.get("contact"),
+            event=data.get("event"),
+            ticket_type=data.get("ticket_type"),
+            queryset=access_scope(self.request).filter(Ticket.objects.all()),
+        ))
+
+        on_duplicate = self.request.query_params.get("on_duplicate", settings.TICKET_DUPLICATE_ACTION)
+        if self._similar_tickets and on_duplicate == "reject":
+            raise DuplicateTicket({
+                "detail": DuplicateTicket.default_detail,
+                "similar_tickets": self._similar_tickets,
+            })
+
         user = self.request.user
         serializer.save(reported_by=user if user and user.is_authenticated else None)
+
+    def perform_update(self, serializer):
+        old_status = serializer.instance.ticket_status
+        ticket = serializer.save()
+
+        user = self.request.user
+        actor = user if user.is_authenticated else None
+        unblocked = []
+
+        if old_status == TicketStatus.BLOCKED and ticket.ticket_status != TicketStatus.BLOCKED:
+            unblocked.append(ticket)
+
+        # Finishing a ticket frees the tickets that were only waiting on it
+        if ticket.ticket_status in RESOLVED_TICKET_STATUSES and old_status not in RESOLVED_TICKET_STATUSES:
+            unblocked += release_dependents(ticket, audit_context=audit_context(self.request))
+
+        notify_watchers(unblocked, NotificationEvent.UNBLOCKED, actor=actor)
+
+
+class TicketTemplateViewSet(TransactionPolicyMixin, IdempotentMixin, BufferedAuditMixin, viewsets.ModelViewSet):
+    queryset = TicketTemplate.objects.prefetch_related("items").order_by("name")
+    serializer_class = TicketTemplateSerializer
+    # Templates are shared, and instantiating one creates tickets in bulk
+    permission_classes = [IsAuthenticated, IsOrganizerOrReadOnly]
+    filter_backends = [filters.SearchFilter]
+    search_fields = ['name']
+
+    def perform_create(self, serializer):
+        user = self.request.user
+        serializer.save(created_by=user if user.is_authenticated else None)
+
+    @action(detail=True, methods=["post"], serializer_class=TicketTemplateInstantiateSerializer)
+    def instantiate(self, request, pk=None):
+        """
+        POST /ticket-templates/{id}/instantiate/ {"event": 3}
+        Creates the template's tickets for the event, due relative to its
+        start. Safe to retry: a template is only instantiated once per
+        event, and later calls return the existing tickets with 200.
+        """
+        template = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = request.user
+        instance, tickets, created = instantiate_template(
+            template,
+            serializer.validated_data["event"],
+            reported_by=user if user.is_authenticated else None,
+            audit_context=audit_context(request),
+        )
+
+        return Response(
+            {
+                "instance": instance.id,
+                "created": created,
+                "tickets": TicketSerializer(tickets, many=True).data,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )